@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class MovieAPIConfig(AppConfig):
+    name = "MovieAPI"
+    verbose_name = "Movie API"
+
+    def ready(self):
+        from . import database  # noqa: F401
@@ -0,0 +1,461 @@
+"""
+Seeded benchmark of every route in movie.urls and user.urls, see the
+benchmark_api command.
+"""
+import io
+import itertools
+import json
+import math
+import random
+import time
+from contextlib import redirect_stdout
+from datetime import date
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.tokens import PasswordResetTokenGenerator
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, get_resolver, reverse
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from faker import Faker
+from rest_framework.test import APIClient
+from movie.cache import get_cache
+from movie.models import Genre, Movie, Review
+from movie.review_stats import review_added
+from user.models import User
+
+PASSWORD = "Benchmark-Passw0rd"
+URLCONFS = ["movie.urls", "user.urls"]
+# p50 and p95 changes beyond the threshold are regressions, p99 of a short
+# run is mostly noise
+REGRESSION_METRICS = ["p50_ms", "p95_ms"]
+
+
+class Catalog:
+    def __init__(self, users, admin, genres, movies):
+        self.users = users
+        self.admin = admin
+        self.genres = genres
+        self.movies = movies
+
+    def volumes(self):
+        return {
+            "users": len(self.users),
+            "genres": len(self.genres),
+            "movies": len(self.movies),
+            "reviews": Review.objects.count(),
+        }
+
+
+def seed(users=50, genres=20, movies=1000, reviews=5000, seed=0):
+    """
+    Fills the database with fake users, genres, movies and reviews, the same
+    ones for the same seed. Returns a Catalog.
+    """
+    fake = Faker()
+    fake.seed_instance(seed)
+    rng = random.Random(seed)
+    # hashed once, every seeded user logs in with PASSWORD
+    password = make_password(PASSWORD)
+    users = User.objects.bulk_create(
+        User(
+            email=fake.unique.email(),
+            username="%s%d" % (fake.user_name()[:40], i),
+            password=password,
+            is_verified=True,
+        )
+        for i in range(users)
+    )
+    admin = User.objects.create(
+        email="admin@benchmark.local",
+        username="benchmarkadmin",
+        password=password,
+        is_verified=True,
+        is_admin=True,
+    )
+    genres = Genre.objects.bulk_create(
+        Genre(name="%s %d" % (fake.word().title(), i)) for i in range(genres)
+    )
+    movies = Movie.objects.bulk_create(
+        Movie(
+            name=fake.sentence(nb_words=3)[:50],
+            release_date=fake.date_between(date(1950, 1, 1), date(2022, 12, 31)),
+            rating=fake.random_int(0, 10),
+        )
+        for _ in range(movies)
+    )
+    Movie.genre.through.objects.bulk_create(
+        Movie.genre.through(movie_id=movie.id, genre_id=genre.id)
+        for movie in movies
+        for genre in rng.sample(genres, min(len(genres), rng.randint(1, 3)))
+    )
+    # one review per user and movie at most, like CreateReviewView allows
+    pairs = rng.sample(
+        range(len(users) * len(movies)), min(reviews, len(users) * len(movies))
+    )
+    Review.objects.bulk_create(
+        Review(
+            user_id=users[pair % len(users)].id,
+            movie_id=movies[pair // len(users)].id,
+            description=fake.sentence()[:250],
+        )
+        for pair in pairs
+    )
+    call_command("rebuild_review_stats", stdout=io.StringIO())
+    return Catalog(users, admin, genres, movies)
+
+
+class Scenario:
+    """
+    Builds the requests of each route from the seeded catalog, one method
+    per route name. Rows a write consumes are created by the builder, outside
+    the timed request, so every iteration does the same work.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.user = catalog.users[0]
+        self.counter = itertools.count()
+
+    def unique(self, prefix):
+        return "%s %d" % (prefix, next(self.counter))
+
+    def pick(self, objects, i):
+        return objects[i % len(objects)]
+
+    def new_movie(self):
+        return Movie.objects.create(
+            name=self.unique("Movie"), release_date=date(2000, 1, 1), rating=5
+        )
+
+    def new_review(self):
+        review = Review.objects.create(
+            user=self.user, movie=self.new_movie(), description="Great"
+        )
+        review_added(review)
+        return review
+
+    def new_user(self, **fields):
+        name = self.unique("user").replace(" ", "")
+        return User.objects.create(
+            email="%s@benchmark.local" % name,
+            username=name,
+            password=self.user.password,
+            **fields
+        )
+
+    def movie_data(self, i):
+        return {
+            "name": self.unique("Movie"),
+            "release_date": "2001-01-01",
+            "rating": i % 11,
+            "genre": [{"name": self.pick(self.catalog.genres, i).name}],
+        }
+
+    def list_genres(self, i):
+        return {}
+
+    def retrieve_genre(self, i):
+        return {"kwargs": {"pk": self.pick(self.catalog.genres, i).id}}
+
+    def create_genre(self, i):
+        return {
+            "method": "post",
+            "user": self.user,
+            "data": {"name": self.unique("Genre")},
+        }
+
+    def update_genre(self, i):
+        genre = Genre.objects.create(name=self.unique("Genre"))
+        return {
+            "method": "put",
+            "user": self.user,
+            "kwargs": {"pk": genre.id},
+            "data": {"name": self.unique("Genre")},
+        }
+
+    def delete_genre(self, i):
+        genre = Genre.objects.create(name=self.unique("Genre"))
+        return {"method": "delete", "user": self.user, "kwargs": {"pk": genre.id}}
+
+    def list_movies(self, i):
+        return {}
+
+    def export_movies(self, i):
+        return {"user": self.user}
+
+    def search_movies(self, i):
+        return {"query": {"q": self.pick(self.catalog.movies, i).name.split()[0]}}
+
+    def retrieve_movie(self, i):
+        return {"kwargs": {"pk": self.pick(self.catalog.movies, i).id}}
+
+    def movie_reviews(self, i):
+        return {"kwargs": {"pk": self.pick(self.catalog.movies, i).id}}
+
+    def create_movie(self, i):
+        return {"method": "post", "user": self.user, "data": self.movie_data(i)}
+
+    def import_movies(self, i):
+        lines = "".join(json.dumps(self.movie_data(i)) + "\n" for _ in range(10))
+        upload = SimpleUploadedFile("movies.jsonl", lines.encode())
+        return {
+            "method": "post",
+            "user": self.user,
+            "data": {"file": upload},
+            "format": "multipart",
+        }
+
+    def batch_create_movies(self, i):
+        return {
+            "method": "post",
+            "user": self.user,
+            "data": [self.movie_data(i) for _ in range(10)],
+        }
+
+    def update_movie(self, i):
+        return {
+            "method": "put",
+            "user": self.user,
+            "kwargs": {"pk": self.new_movie().id},
+            "data": self.movie_data(i),
+        }
+
+    def delete_movie(self, i):
+        return {
+            "method": "delete",
+            "user": self.user,
+            "kwargs": {"pk": self.new_movie().id},
+        }
+
+    def create_review(self, i):
+        return {
+            "method": "post",
+            "user": self.user,
+            "kwargs": {"pk": self.new_movie().id},
+            "data": {"description": "Great"},
+        }
+
+    def batch_create_reviews(self, i):
+        return {
+            "method": "post",
+            "user": self.user,
+            "data": [
+                {"movie": self.new_movie().id, "description": "Great"}
+                for _ in range(10)
+            ],
+        }
+
+    def update_review(self, i):
+        return {
+            "method": "put",
+            "user": self.user,
+            "kwargs": {"pk": self.new_review().id},
+            "data": {"description": "Even better"},
+        }
+
+    def delete_review(self, i):
+        return {
+            "method": "delete",
+            "user": self.user,
+            "kwargs": {"pk": self.new_review().id},
+        }
+
+    def cache_stats(self, i):
+        return {"user": self.catalog.admin}
+
+    def async_list_movies(self, i):
+        return {}
+
+    def async_retrieve_movie(self, i):
+        return self.retrieve_movie(i)
+
+    def async_list_genres(self, i):
+        return {}
+
+    def async_retrieve_genre(self, i):
+        return self.retrieve_genre(i)
+
+    def register(self, i):
+        name = self.unique("user").replace(" ", "")
+        return {
+            "method": "post",
+            "data": {
+                "email": "%s@benchmark.local" % name,
+                "username": name,
+                "password": PASSWORD,
+                "password2": PASSWORD,
+            },
+        }
+
+    def email_verify(self, i):
+        token = self.new_user().tokens()["access"]
+        return {"query": {"token": token}}
+
+    def login(self, i):
+        user = self.pick(self.catalog.users, i)
+        return {"method": "post", "data": {"email": user.email, "password": PASSWORD}}
+
+    def logout(self, i):
+        refresh = self.user.tokens()["refresh"]
+        return {"method": "post", "user": self.user, "data": {"refresh": refresh}}
+
+    def token_refresh(self, i):
+        return {"method": "post", "data": {"refresh": self.user.tokens()["refresh"]}}
+
+    def token_stats(self, i):
+        return {"user": self.catalog.admin}
+
+    def profile(self, i):
+        return {"user": self.user}
+
+    def password_change(self, i):
+        # another account each time, they are rate limited too
+        return {
+            "method": "post",
+            "user": self.pick(self.catalog.users, i),
+            "data": {"password": PASSWORD, "password2": PASSWORD},
+        }
+
+    def request_password_reset_email(self, i):
+        return {"method": "post", "data": {"email": self.user.email}}
+
+    def password_reset(self, i):
+        user = self.new_user(is_verified=True)
+        return {
+            "method": "post",
+            "kwargs": {
+                "uidb64": urlsafe_base64_encode(force_bytes(user.id)),
+                "token": PasswordResetTokenGenerator().make_token(user),
+            },
+            "data": {"password": PASSWORD, "password2": PASSWORD},
+        }
+
+
+def route_names():
+    return [
+        pattern.name
+        for urlconf in URLCONFS
+        for pattern in get_resolver(urlconf).url_patterns
+        if isinstance(pattern, URLPattern)
+    ]
+
+
+def percentile(values, p):
+    # nearest rank
+    values = sorted(values)
+    return values[max(0, math.ceil(len(values) * p / 100) - 1)]
+
+
+def measure(client, request):
+    """
+    Sends one request, returns (seconds, queries, bytes, status code).
+    Streamed responses are consumed inside the timed section.
+    """
+    method = getattr(client, request.get("method", "get"))
+    url = reverse(request["name"], kwargs=request.get("kwargs"))
+    if "query" in request:
+        options = {"data": request["query"]}
+    else:
+        options = {"data": request.get("data"), "format": request.get("format", "json")}
+    # hashing views are rate limited per IP, each request is another client
+    options["REMOTE_ADDR"] = request["remote_addr"]
+    if request.get("user"):
+        access = request["user"].tokens()["access"]
+        client.credentials(HTTP_AUTHORIZATION="Bearer " + access)
+    else:
+        client.credentials()
+    # views that send emails print their links
+    with redirect_stdout(io.StringIO()), CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        response = method(url, **options)
+        if response.streaming:
+            size = sum(map(len, response.streaming_content))
+        else:
+            size = len(response.content)
+        seconds = time.perf_counter() - start
+    return seconds, len(queries), size, response.status_code
+
+
+def run(catalog, iterations=20, warmup=2, cached=False, routes=None):
+    """
+    Requests every route iterations times after warmup unrecorded requests.
+    Returns {route name: stats}, stats hold the latency percentiles in
+    milliseconds, the most queries and bytes of a request, the last status
+    code and the number of error responses. The response cache is cleared
+    before each request unless cached.
+    """
+    scenario = Scenario(catalog)
+    # a failing view is counted as an error response, not raised
+    client = APIClient(raise_request_exception=False)
+    addresses = itertools.product(range(256), repeat=3)
+    results = {}
+    for name in routes or route_names():
+        builder = getattr(scenario, name.replace("-", "_"))
+        latencies, queries, sizes, errors = [], [], [], 0
+        for i in range(warmup + iterations):
+            request = builder(i)
+            request["name"] = name
+            request["remote_addr"] = "10.%d.%d.%d" % next(addresses)
+            if not cached:
+                get_cache().clear()
+            seconds, count, size, status = measure(client, request)
+            if i < warmup:
+                continue
+            latencies.append(seconds * 1e3)
+            queries.append(count)
+            sizes.append(size)
+            errors += status >= 400
+        results[name] = {
+            "method": request.get("method", "get").upper(),
+            "status": status,
+            "errors": errors,
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "queries": max(queries),
+            "bytes": max(sizes),
+        }
+    return results
+
+
+def report(catalog, results, iterations, cached=False):
+    return {
+        "created_at": timezone.now().isoformat(),
+        "database": connection.vendor,
+        "volumes": catalog.volumes(),
+        "iterations": iterations,
+        "cached": cached,
+        "endpoints": results,
+    }
+
+
+def compare(results, baseline, threshold=20.0):
+    """
+    Returns {route name: changes} against the endpoints of a baseline report
+    and the list of regressions, latencies grown by more than threshold
+    percent or more queries. Changes are in percent, queries in numbers.
+    """
+    changes = {}
+    regressions = []
+    for name, stats in results.items():
+        old = baseline.get("endpoints", {}).get(name)
+        if old is None:
+            continue
+        change = {}
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "bytes"):
+            if old[metric]:
+                change[metric] = round(
+                    (stats[metric] - old[metric]) * 100 / old[metric], 1
+                )
+        change["queries"] = stats["queries"] - old["queries"]
+        changes[name] = change
+        for metric in REGRESSION_METRICS:
+            if change.get(metric, 0) > threshold:
+                regressions.append("%s %s %+.1f%%" % (name, metric, change[metric]))
+        if change["queries"] > 0:
+            regressions.append("%s queries %+d" % (name, change["queries"]))
+    return changes, regressions
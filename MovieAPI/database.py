@@ -0,0 +1,57 @@
+"""
+Project wide hooks on database connections, connected by MovieAPIConfig
+before the receivers of the apps.
+
+New sqlite connections are tuned with settings.SQLITE_PRAGMAS.
+
+Request middlewares watch queries with observe_queries() rather than
+connection.execute_wrapper(). Django keeps connections per thread, and the
+async views query from worker threads, so a wrapper installed from the
+event loop never sees their queries. Every connection gets one wrapper
+instead, when it opens, which hands each query to the observers of the
+current context; sync_to_async runs code with a copy of that context.
+"""
+import contextvars
+from contextlib import contextmanager
+from functools import partial
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+_observers = contextvars.ContextVar("query_observers", default=())
+
+
+def run_observers(execute, sql, params, many, context):
+    # the first observer is the outermost, as with nested execute_wrapper()
+    for observer in reversed(_observers.get()):
+        execute = partial(observer, execute)
+    return execute(sql, params, many, context)
+
+
+@contextmanager
+def observe_queries(observer):
+    """
+    Calls observer like an execute wrapper for every query of this context
+    and of the threads it hands work to.
+    """
+    token = _observers.set(_observers.get() + (observer,))
+    try:
+        yield observer
+    finally:
+        _observers.reset(token)
+
+
+@receiver(connection_created)
+def install_observers(sender, connection, **kwargs):
+    # connection_created is sent again on reconnects
+    if run_observers not in connection.execute_wrappers:
+        connection.execute_wrappers.append(run_observers)
+
+
+@receiver(connection_created)
+def tune_sqlite_connection(sender, connection, **kwargs):
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute("PRAGMA %s = %s" % (name, value))
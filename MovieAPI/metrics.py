@@ -0,0 +1,282 @@
+"""
+Per view request metrics served in the Prometheus text format at /metrics.
+
+Every thread counts into its own dict, so requests never wait on a lock,
+and a scrape sums the dicts of all threads. Pre-fork servers run one copy
+per worker process: with METRICS_DIR set each process also writes its
+totals there, at most every METRICS_FLUSH_INTERVAL seconds and at exit, and
+a scrape of any worker adds up every file in the directory. Empty the
+directory when the server starts, counters of old processes are kept.
+"""
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views import View
+from .database import observe_queries
+
+REQUESTS = "movieapi_http_requests_total"
+DURATION = "movieapi_http_request_duration_seconds"
+RESPONSE_SIZE = "movieapi_http_response_size_bytes"
+QUERIES = "movieapi_db_queries_total"
+QUERY_DURATION = "movieapi_db_query_duration_seconds_total"
+FAMILIES = {
+    REQUESTS: ("counter", "Requests by view, method and status class."),
+    DURATION: ("histogram", "Time to build the response by view and method."),
+    RESPONSE_SIZE: ("summary", "Size of non streamed response bodies by view."),
+    QUERIES: ("counter", "Database queries by view."),
+    QUERY_DURATION: ("counter", "Time spent in database queries by view."),
+}
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+# {(family, suffix, labels): value} of each thread, labels is a tuple of
+# (name, value) pairs
+_shards = []
+_shards_lock = threading.Lock()
+_local = threading.local()
+_flush_lock = threading.Lock()
+_last_flush = 0.0
+
+
+def _shard():
+    try:
+        return _local.shard
+    except AttributeError:
+        shard = _local.shard = defaultdict(float)
+        # the shard outlives its thread, counters never go down
+        with _shards_lock:
+            _shards.append(shard)
+        return shard
+
+
+def observe(view, method, status, seconds, size, queries, query_seconds):
+    shard = _shard()
+    labels = (("view", view), ("method", method))
+    status = "%dxx" % (status // 100)
+    shard[(REQUESTS, "", labels + (("status", status),))] += 1
+    for le in BUCKETS:
+        # empty buckets are exposed too
+        shard[(DURATION, "_bucket", labels + (("le", le),))] += seconds <= le
+    shard[(DURATION, "_sum", labels)] += seconds
+    shard[(DURATION, "_count", labels)] += 1
+    labels = (("view", view),)
+    if size is not None:
+        shard[(RESPONSE_SIZE, "_sum", labels)] += size
+        shard[(RESPONSE_SIZE, "_count", labels)] += 1
+    shard[(QUERIES, "", labels)] += queries
+    shard[(QUERY_DURATION, "", labels)] += query_seconds
+
+
+def snapshot():
+    """
+    Totals of this process. dict.copy() runs under the GIL, so a shard is
+    never read while its thread adds a key.
+    """
+    with _shards_lock:
+        shards = list(_shards)
+    totals = defaultdict(float)
+    for shard in shards:
+        for key, value in shard.copy().items():
+            totals[key] += value
+    return totals
+
+
+def clear():
+    with _shards_lock:
+        for shard in _shards:
+            shard.clear()
+
+
+def _path(directory, pid):
+    return os.path.join(directory, "%d.json" % pid)
+
+
+def write_snapshot(directory):
+    path = _path(directory, os.getpid())
+    rows = [
+        [family, suffix, labels, value]
+        for (family, suffix, labels), value in snapshot().items()
+    ]
+    # readers only ever see a complete file
+    with open(path + ".tmp", "w") as file:
+        json.dump(rows, file)
+    os.replace(path + ".tmp", path)
+
+
+def read_snapshots(directory):
+    """
+    Totals of every process that wrote to directory, this one's are live.
+    """
+    totals = snapshot()
+    own = _path(directory, os.getpid())
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        if path == own:
+            continue
+        try:
+            with open(path) as file:
+                rows = json.load(file)
+        except (OSError, ValueError):
+            continue
+        for family, suffix, labels, value in rows:
+            totals[(family, suffix, tuple(map(tuple, labels)))] += value
+    return totals
+
+
+def flush(force=False):
+    global _last_flush
+    directory = settings.METRICS_DIR
+    if not directory:
+        return
+    if not force and time.monotonic() - _last_flush < settings.METRICS_FLUSH_INTERVAL:
+        return
+    # one thread writes, the others carry on
+    if not _flush_lock.acquire(blocking=False):
+        return
+    try:
+        _last_flush = time.monotonic()
+        write_snapshot(directory)
+    finally:
+        _flush_lock.release()
+
+
+atexit.register(flush, force=True)
+
+
+def collect():
+    if settings.METRICS_DIR:
+        return read_snapshots(settings.METRICS_DIR)
+    return snapshot()
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def format_labels(labels):
+    return ",".join(
+        '%s="%s"'
+        % (
+            name,
+            format_value(value)
+            if name == "le"
+            else str(value).replace("\\", "\\\\").replace('"', '\\"'),
+        )
+        for name, value in labels
+    )
+
+
+def render(totals):
+    """
+    Prometheus text exposition format 0.0.4 of totals.
+    """
+    families = defaultdict(list)
+    for (family, suffix, labels), value in totals.items():
+        families[family].append((suffix, labels, value))
+    lines = []
+    for family, (kind, help) in FAMILIES.items():
+        lines.append("# HELP %s %s" % (family, help))
+        lines.append("# TYPE %s %s" % (family, kind))
+        # buckets in le order, before the _count and _sum of the same labels
+        samples = sorted(
+            families[family],
+            key=lambda sample: (
+                [label for label in sample[1] if label[0] != "le"],
+                sample[0] != "_bucket",
+                sample[0],
+                dict(sample[1]).get("le", 0),
+            ),
+        )
+        for suffix, labels, value in samples:
+            lines.append(
+                "%s%s{%s} %s"
+                % (family, suffix, format_labels(labels), format_value(value))
+            )
+    return "\n".join(lines) + "\n"
+
+
+class QueryTimer:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+class MetricsMiddleware:
+    """
+    Records each request under the name of its url pattern, e.g.
+    list-movies, or "unmatched". Streamed responses are timed up to the
+    start of the stream and have no size. Runs in the event loop under
+    ASGI, so the async views aren't moved to a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        queries = QueryTimer()
+        start = time.perf_counter()
+        with observe_queries(queries):
+            response = self.get_response(request)
+        self.observe(request, response, time.perf_counter() - start, queries)
+        return response
+
+    async def __acall__(self, request):
+        queries = QueryTimer()
+        start = time.perf_counter()
+        with observe_queries(queries):
+            response = await self.get_response(request)
+        self.observe(request, response, time.perf_counter() - start, queries)
+        return response
+
+    def observe(self, request, response, seconds, queries):
+        match = request.resolver_match
+        observe(
+            view=match.view_name if match else "unmatched",
+            method=request.method,
+            status=response.status_code,
+            seconds=seconds,
+            size=None if response.streaming else len(response.content),
+            queries=queries.count,
+            query_seconds=queries.seconds,
+        )
+        # a small file write at most every METRICS_FLUSH_INTERVAL seconds
+        flush()
+
+
+class MetricsView(View):
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def get(self, request):
+        token = settings.METRICS_TOKEN
+        if token and not constant_time_compare(
+            request.headers.get("Authorization", ""), "Bearer %s" % token
+        ):
+            return HttpResponse(status=403)
+        flush(force=True)
+        return HttpResponse(render(collect()), content_type=self.content_type)
@@ -0,0 +1,170 @@
+"""
+On demand profiling of single requests for staff users. Add
+?__profile=cprofile to any request, or send an X-Profile: cprofile header,
+to get a cProfile report sorted by cumulative time (?__profile_sort=tottime
+or calls to change it) and the query log instead of the response.
+__profile=prof returns a zip with the .prof file, e.g. for snakeviz, and
+the query log. Other requests only pay a substring check,
+PROFILING_ENABLED=False removes the middleware.
+
+Under ASGI the profile covers the event loop while the request runs, which
+may include other requests, and not the worker threads the async views
+query the database from. The query log has every query.
+"""
+import cProfile
+import io
+import marshal
+import pstats
+import time
+import zipfile
+from contextlib import contextmanager
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from .database import observe_queries
+
+PARAM = "__profile"
+HEADER = "HTTP_X_PROFILE"
+SORT_KEYS = ("cumulative", "tottime", "calls")
+# functions listed in the text report
+REPORT_LINES = 60
+
+
+class QueryLog:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                (time.perf_counter() - start, context["connection"].alias, sql, params)
+            )
+
+    def report(self):
+        total = sum(query[0] for query in self.queries)
+        lines = ["%d queries in %.2f ms" % (len(self.queries), total * 1e3)]
+        for seconds, alias, sql, params in self.queries:
+            lines.append("")
+            lines.append("%.2f ms on %s" % (seconds * 1e3, alias))
+            lines.append(sql)
+            if params:
+                lines.append("params: %r" % (params,))
+        return "\n".join(lines) + "\n"
+
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        mode = self.requested_mode(request)
+        # anyone else gets the normal response
+        if mode is None or not self.is_staff(request):
+            return self.get_response(request)
+        queries, profiler = QueryLog(), cProfile.Profile()
+        with self.profiling(queries, profiler):
+            response = self.get_response(request)
+            size = self.read(response)
+        return self.report(request, mode, response, size, queries, profiler)
+
+    async def __acall__(self, request):
+        mode = self.requested_mode(request)
+        # the user is loaded from the database
+        if mode is None or not await sync_to_async(self.is_staff)(request):
+            return await self.get_response(request)
+        queries, profiler = QueryLog(), cProfile.Profile()
+        with self.profiling(queries, profiler):
+            response = await self.get_response(request)
+            size = await sync_to_async(self.read)(response)
+        return self.report(request, mode, response, size, queries, profiler)
+
+    def requested_mode(self, request):
+        if PARAM not in request.META.get("QUERY_STRING", "") and (
+            HEADER not in request.META
+        ):
+            return None
+        mode = request.GET.get(PARAM) or request.META.get(HEADER)
+        return mode.strip().lower() if mode else None
+
+    def is_staff(self, request):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_staff:
+            return True
+        # API clients send a JWT, which DRF only authenticates in the view
+        authenticators = [
+            authentication()
+            for authentication in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+        ]
+        try:
+            return bool(Request(request, authenticators=authenticators).user.is_staff)
+        except APIException:
+            return False
+
+    @contextmanager
+    def profiling(self, queries, profiler):
+        with observe_queries(queries):
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+
+    def read(self, response):
+        if response.streaming:
+            # a streamed body is built while it's read
+            return sum(map(len, response.streaming_content))
+        return len(response.content)
+
+    def report(self, request, mode, response, size, queries, profiler):
+        match = request.resolver_match
+        name = match.url_name if match and match.url_name else "request"
+        stats = pstats.Stats(profiler)
+        if mode == "prof":
+            archive = io.BytesIO()
+            with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as file:
+                file.writestr("%s.prof" % name, marshal.dumps(stats.stats))
+                file.writestr("queries.txt", queries.report())
+            profiled = HttpResponse(archive.getvalue(), content_type="application/zip")
+            profiled["Content-Disposition"] = (
+                'attachment; filename="profile-%s.zip"' % name
+            )
+        else:
+            report = io.StringIO()
+            report.write(
+                "%s %s -> %d, %d bytes, view %s\n\n"
+                % (
+                    request.method,
+                    request.get_full_path(),
+                    response.status_code,
+                    size,
+                    name,
+                )
+            )
+            sort = request.GET.get(PARAM + "_sort")
+            if sort not in SORT_KEYS:
+                sort = "cumulative"
+            stats.stream = report
+            stats.sort_stats(sort).print_stats(REPORT_LINES)
+            report.write(queries.report())
+            profiled = HttpResponse(
+                report.getvalue(), content_type="text/plain; charset=utf-8"
+            )
+        profiled["X-Profiled-Status"] = response.status_code
+        return profiled
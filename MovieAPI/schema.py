@@ -0,0 +1,120 @@
+"""
+The OpenAPI schema is generated once per code version and served from
+memory with an ETag. The generate_schema command writes it to
+API_SCHEMA_FILE at deploy time, so workers load it instead of introspecting
+every view and serializer.
+"""
+import hashlib
+import json
+import os
+import threading
+from functools import lru_cache
+import drf_yasg
+from django.apps import apps
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson
+from drf_yasg.generators import OpenAPISchemaGenerator
+from drf_yasg.views import SPEC_RENDERERS, get_schema_view
+from rest_framework import permissions
+
+INFO = openapi.Info(
+    title="Movie API",
+    default_version="v1",
+)
+
+
+def source_files():
+    base = str(settings.BASE_DIR)
+    roots = [app.path for app in apps.get_app_configs() if app.path.startswith(base)]
+    roots.append(os.path.join(base, "MovieAPI"))
+    for root in roots:
+        for path, dirs, files in os.walk(root):
+            dirs[:] = [name for name in dirs if name not in ("tests", "__pycache__")]
+            for name in files:
+                if name.endswith(".py"):
+                    yield os.path.join(path, name)
+
+
+@lru_cache(maxsize=None)
+def code_version():
+    # API_SCHEMA_VERSION, e.g. the deployed commit, saves hashing the sources
+    if settings.API_SCHEMA_VERSION:
+        return settings.API_SCHEMA_VERSION
+    digest = hashlib.sha256(drf_yasg.__version__.encode())
+    for path in sorted(source_files()):
+        digest.update(os.path.relpath(path, settings.BASE_DIR).encode())
+        with open(path, "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()[:16]
+
+
+def generate_schema():
+    schema = OpenAPISchemaGenerator(INFO).get_schema(request=None, public=True)
+    schema["x-code-version"] = code_version()
+    return schema
+
+
+def write_schema_file(path=None):
+    content = OpenAPICodecJson(validators=[]).encode(generate_schema())
+    with open(path or settings.API_SCHEMA_FILE, "wb") as file:
+        file.write(content)
+    return content
+
+
+def read_schema_file():
+    # the file is used only if it was written by the same code version
+    try:
+        with open(settings.API_SCHEMA_FILE, "rb") as file:
+            content = file.read()
+    except FileNotFoundError:
+        return None
+    if json.loads(content).get("x-code-version") != code_version():
+        return None
+    return content
+
+
+# (code version, renderer format) -> rendered schema
+_rendered = {}
+_lock = threading.Lock()
+
+
+def clear_schema_cache():
+    _rendered.clear()
+    code_version.cache_clear()
+
+
+def render_schema(renderer):
+    key = (code_version(), renderer.format)
+    if key not in _rendered:
+        with _lock:
+            if key not in _rendered:
+                content = None
+                if renderer.codec_class is OpenAPICodecJson:
+                    content = read_schema_file()
+                _rendered[key] = content or renderer.render(generate_schema())
+    return _rendered[key]
+
+
+class SchemaView(
+    get_schema_view(INFO, public=True, permission_classes=[permissions.AllowAny])
+):
+    def get(self, request, version="", format=None):
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, SPEC_RENDERERS):
+            # the swagger and redoc pages don't introspect views, they load
+            # the spec from ?format=openapi
+            return super().get(request, version, format)
+        etag = '"%s"' % code_version()
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(
+                render_schema(renderer),
+                content_type="%s; charset=utf-8" % renderer.media_type,
+            )
+        response["ETag"] = etag
+        # clients revalidate with the ETag and get a 304 until a deploy
+        patch_cache_control(response, no_cache=True)
+        return response
@@ -43,11 +43,16 @@ INSTALLED_APPS = [
     "rest_framework_simplejwt",
     "rest_framework_simplejwt.token_blacklist",
     "drf_yasg",
+    # project wide database hooks, before the apps that query
+    "MovieAPI",
     "user",
     "movie",
 ]
 
 MIDDLEWARE = [
+    # first, so the time of every other middleware is included
+    "MovieAPI.metrics.MetricsMiddleware",
+    "MovieAPI.slow_queries.SlowQueryMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -55,6 +60,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    # after the session user is known
+    "MovieAPI.profiling.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "MovieAPI.urls"
@@ -81,11 +88,40 @@ WSGI_APPLICATION = "MovieAPI.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# DB_ENGINE=postgresql switches to postgres, configured by DB_NAME, DB_USER,
+# DB_PASSWORD, DB_HOST and DB_PORT. Connections are kept open for
+# DB_CONN_MAX_AGE seconds and checked before they are reused.
+if os.environ.get("DB_ENGINE") == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("DB_NAME", "movieapi"),
+            "USER": os.environ.get("DB_USER", ""),
+            "PASSWORD": os.environ.get("DB_PASSWORD", ""),
+            "HOST": os.environ.get("DB_HOST", ""),
+            "PORT": os.environ.get("DB_PORT", ""),
+            "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 600)),
+            "CONN_HEALTH_CHECKS": True,
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("DB_NAME", BASE_DIR / "db.sqlite3"),
+            "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 600)),
+            "CONN_HEALTH_CHECKS": True,
+        }
     }
+
+# applied to every new sqlite connection, see MovieAPI/database.py. WAL lets
+# readers run alongside the writer, NORMAL syncs only at checkpoints, which
+# is safe in WAL mode, and writers wait up to busy_timeout(ms) for the lock
+SQLITE_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "busy_timeout": 5000,
+    "mmap_size": 256 * 1024 * 1024,
 }
 
 
@@ -133,18 +169,48 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "user.User"
 
 REST_FRAMEWORK = {
+    # user.authentication.ClaimsJWTAuthentication or
+    # user.authentication.CachedUserJWTAuthentication skip the user query
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        os.environ.get(
+            "JWT_AUTHENTICATION",
+            "rest_framework_simplejwt.authentication.JWTAuthentication",
+        ),
     ),
     "NON_FIELD_ERRORS_KEY": "error",
+    # token buckets of the password hashing views, see user/throttling.py
+    "DEFAULT_THROTTLE_RATES": {
+        "hashing_ip": os.environ.get("HASHING_IP_RATE", "60/min"),
+        "hashing_email": os.environ.get("HASHING_EMAIL_RATE", "10/min"),
+    },
 }
 
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=10),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    "TOKEN_REFRESH_SERIALIZER": "user.tokens.TokenRefreshSerializer",
 }
 
+# seconds CachedUserJWTAuthentication keeps a user in each process, and how
+# many users it keeps at most, the least recently used go first
+USER_AUTH_CACHE_TIMEOUT = 60
+USER_AUTH_CACHE_SIZE = 1000
+
+# cache alias of refresh token blacklist lookups and how long(seconds) a not
+# blacklisted token is remembered. With several processes the "user" cache
+# must be shared, or a logged out token keeps refreshing in other workers
+USER_TOKEN_BLACKLIST_CACHE = "user"
+USER_TOKEN_BLACKLIST_CACHE_TIMEOUT = 60
+
+# cache alias of the hashing throttle buckets, each process allows the full
+# rate unless the "user" cache is shared by all workers
+USER_THROTTLE_CACHE = "user"
+# password hashing requests at once per process, defaults to the cpu count,
+# and the Retry-After(seconds) of the ones turned away
+USER_HASHING_CONCURRENCY = int(os.environ.get("USER_HASHING_CONCURRENCY", 0))
+USER_HASHING_RETRY_AFTER = 1
+
 
 EMAIL_BACKEND = os.environ.get("EMAIL_BACKEND")
 EMAIL_HOST = os.environ.get("EMAIL_HOST")
@@ -160,5 +226,68 @@ SWAGGER_SETTINGS = {
     }
 }
 
+# schema written by the generate_schema command, used while its code version
+# matches the running code. API_SCHEMA_VERSION overrides the version computed
+# from the source files
+API_SCHEMA_FILE = os.environ.get("API_SCHEMA_FILE", BASE_DIR / "api-schema.json")
+API_SCHEMA_VERSION = os.environ.get("API_SCHEMA_VERSION", "")
+
+# per view request metrics served at /metrics, see MovieAPI.metrics. With
+# several worker processes set METRICS_DIR to a directory they share, each
+# process writes its totals there every METRICS_FLUSH_INTERVAL seconds.
+# METRICS_TOKEN makes scrapes send "Authorization: Bearer <token>"
+METRICS_DIR = os.environ.get("METRICS_DIR", "")
+METRICS_FLUSH_INTERVAL = 5
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# queries of a request slower than SLOW_QUERY_THRESHOLD_MS are logged per
+# process, the latest SLOW_QUERY_LOG_SIZE are served at /slow-queries/ to
+# admins. A SLOW_QUERY_EXPLAIN_RATE share of the slow SELECTs is explained
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get("SLOW_QUERY_THRESHOLD_MS", 100))
+SLOW_QUERY_EXPLAIN_RATE = float(os.environ.get("SLOW_QUERY_EXPLAIN_RATE", 0.1))
+SLOW_QUERY_LOG_SIZE = 200
+
+# staff users profile a request with ?__profile=cprofile, see MovieAPI.profiling
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "True") == "True"
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # any django cache backend shared by all workers, e.g. redis, makes the
+    # response cache and its invalidation global instead of per process
+    "movie": {
+        "BACKEND": os.environ.get(
+            "MOVIE_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("MOVIE_CACHE_LOCATION", "movie"),
+    },
+    # throttle buckets and the token blacklist, a shared backend keeps rate
+    # limits and logouts global
+    "user": {
+        "BACKEND": os.environ.get(
+            "USER_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("USER_CACHE_LOCATION", "user"),
+    },
+}
+
+# cache alias and timeout(seconds) of public movie and genre read responses
+MOVIE_RESPONSE_CACHE = "movie"
+MOVIE_RESPONSE_CACHE_TIMEOUT = 300
+
+# number of latest reviews embedded in the movie detail
+MOVIE_REVIEW_PREVIEW_SIZE = 10
+
+# cache genre name -> id lookups of movie create/update in each process
+MOVIE_GENRE_CACHE = os.environ.get("MOVIE_GENRE_CACHE") == "True"
+
+# dotted path of the /movie/search/ backend class, see movie.search. Empty
+# picks the full text search of the database vendor, postgres or sqlite FTS5
+MOVIE_SEARCH_BACKEND = os.environ.get("MOVIE_SEARCH_BACKEND", "")
+
+# most items of a /movie/batch/ or /movie/reviews/batch/ request
+MOVIE_BATCH_MAX_ITEMS = 500
+
 # password reset link timeout
 PASSWORD_RESET_TIMEOUT = 600  # 10 minutes
@@ -0,0 +1,150 @@
+"""
+Log of the queries slower than SLOW_QUERY_THRESHOLD_MS with the view and
+the line of project code that ran them. A SLOW_QUERY_EXPLAIN_RATE share of
+the slow SELECTs is explained right away on the same connection. Entries
+are kept per process in a ring buffer of SLOW_QUERY_LOG_SIZE entries.
+"""
+import os
+import random
+import threading
+import time
+import traceback
+from collections import deque
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .database import observe_queries
+
+# appends and snapshots of a deque are atomic
+entries = deque(maxlen=settings.SLOW_QUERY_LOG_SIZE)
+# longest repr kept of a query parameter
+MAX_PARAM_LENGTH = 200
+_local = threading.local()
+
+
+def call_site():
+    """
+    The innermost frame of project code, outside the installed packages,
+    that ran the query. Frames of the execute wrappers, this one and the
+    ones of other middlewares, are skipped. Queries of the async views run
+    in a worker thread, away from the view's frames, and often have none.
+    """
+    base = str(settings.BASE_DIR) + os.sep
+    wrapped = False
+    for frame, line in traceback.walk_stack(None):
+        code = frame.f_code
+        if not wrapped:
+            wrapped = code.co_name == "_execute_with_wrappers"
+        elif (
+            code.co_filename.startswith(base)
+            and "site-packages" not in code.co_filename
+        ):
+            return "%s:%d in %s" % (
+                os.path.relpath(code.co_filename, base),
+                line,
+                code.co_name,
+            )
+    return None
+
+
+def explain(connection, sql, params):
+    # plain EXPLAIN doesn't run the query, only reads are explained anyway
+    if sql.split(None, 1)[0].upper() not in ("SELECT", "WITH"):
+        return None
+    # the EXPLAIN goes through the wrappers too
+    _local.explaining = True
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "%s %s" % (connection.ops.explain_query_prefix(), sql), params
+            )
+            return "\n".join(str(row[-1]) for row in cursor.fetchall())
+    except Exception as e:
+        return "EXPLAIN failed: %s" % e
+    finally:
+        _local.explaining = False
+
+
+def format_params(params):
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        params = params.values()
+    return [repr(param)[:MAX_PARAM_LENGTH] for param in params]
+
+
+class SlowQueryRecorder:
+    def __init__(self, request):
+        self.request = request
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(_local, "explaining", False):
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        milliseconds = (time.perf_counter() - start) * 1e3
+        if milliseconds >= settings.SLOW_QUERY_THRESHOLD_MS:
+            self.record(context["connection"], sql, params, many, milliseconds)
+        return result
+
+    def record(self, connection, sql, params, many, milliseconds):
+        match = self.request.resolver_match
+        plan = None
+        if not many and random.random() < settings.SLOW_QUERY_EXPLAIN_RATE:
+            plan = explain(connection, sql, params)
+        entries.append(
+            {
+                "at": timezone.now().isoformat(),
+                "duration_ms": round(milliseconds, 3),
+                "database": connection.alias,
+                "view": match.view_name if match else None,
+                "call_site": call_site(),
+                "sql": sql,
+                "params": None if many else format_params(params),
+                "explain": plan,
+            }
+        )
+
+
+class SlowQueryMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with observe_queries(SlowQueryRecorder(request)):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with observe_queries(SlowQueryRecorder(request)):
+            return await self.get_response(request)
+
+
+class SlowQueriesView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        # newest first
+        return Response(
+            {
+                "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+                "explain_rate": settings.SLOW_QUERY_EXPLAIN_RATE,
+                "queries": list(entries)[::-1],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    def delete(self, request):
+        entries.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -15,19 +15,9 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Movie API",
-        default_version="v1",
-    ),
-    public=True,
-    permission_classes=[permissions.AllowAny],
-)
+from .metrics import MetricsView
+from .schema import SchemaView
+from .slow_queries import SlowQueriesView
 
 
 urlpatterns = [
@@ -36,9 +26,11 @@ urlpatterns = [
     path("movie/", include("movie.urls")),
     path(
         "",
-        schema_view.with_ui("swagger", cache_timeout=0),
+        SchemaView.with_ui("swagger"),
         name="schema-swagger-ui",
     ),
-    path("api.json/", schema_view.without_ui(cache_timeout=0), name="schema-json"),
-    path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
+    path("api.json/", SchemaView.without_ui(), name="schema-json"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
+    path("slow-queries/", SlowQueriesView.as_view(), name="slow-queries"),
+    path("redoc/", SchemaView.with_ui("redoc"), name="schema-redoc"),
 ]
@@ -0,0 +1,8 @@
+import os
+import django
+
+
+def setup():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "MovieAPI.settings")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    django.setup()
@@ -0,0 +1,184 @@
+"""
+Many concurrent slow clients reading the movie list, every response takes
+delay ms to reach the client, like a slow download. Behind a WSGI worker
+pool the worker thread writes it and is held meanwhile. Under ASGI the
+requests go through Django's ASGI handler, which awaits the write in the
+event loop. Compares the sync view under WSGI, the sync view under ASGI and
+the native async view, on a throwaway test database, so migrations must
+have been made.
+
+    python -m benchmarks.bench_async [clients] [requests per client] [delay ms]
+"""
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from benchmarks import setup
+
+setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.handlers.asgi import ASGIHandler  # noqa: E402
+from django.db import connection, connections  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from movie.models import Genre, Movie, Review  # noqa: E402
+from user.models import User  # noqa: E402
+
+# threads of a WSGI worker, e.g. gunicorn --threads
+WSGI_THREADS = 8
+
+
+def report(name, latencies, seconds):
+    latencies.sort()
+    print(
+        "%-14s %10.0f %10.1f %10.1f"
+        % (
+            name,
+            len(latencies) / seconds,
+            latencies[len(latencies) // 2] * 1e3,
+            latencies[int(len(latencies) * 0.95)] * 1e3,
+        )
+    )
+
+
+def sync_wsgi(url, clients, requests, delay):
+    local = threading.local()
+    latencies = []
+
+    def handle(queued_at):
+        if not hasattr(local, "client"):
+            local.client = Client()
+        response = local.client.get(url)
+        assert response.status_code == 200, response.status_code
+        # the worker thread writes the response to the slow client
+        time.sleep(delay)
+        latencies.append(time.perf_counter() - queued_at)
+
+    def client():
+        for _ in range(requests):
+            executor.submit(handle, time.perf_counter()).result()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=WSGI_THREADS) as executor:
+        threads = [threading.Thread(target=client) for _ in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return latencies, time.perf_counter() - start
+
+
+async def asgi_get(app, url, delay):
+    """
+    One request straight through the ASGI application. The client reads the
+    response slowly: the server's final write waits delay seconds for the
+    socket to drain, in the event loop, like any ASGI server's send().
+    """
+    path, _, query = url.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+    received = False
+    status = None
+
+    async def receive():
+        nonlocal received
+        if received:
+            # the client stays connected until the handler is done
+            await asyncio.Future()
+        received = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif not message.get("more_body"):
+            await asyncio.sleep(delay)
+
+    await app(scope, receive, send)
+    return status
+
+
+async def asgi(url, clients, requests, delay):
+    app = ASGIHandler()
+    latencies = []
+
+    async def client():
+        for _ in range(requests):
+            start = time.perf_counter()
+            status = await asgi_get(app, url, delay)
+            assert status == 200, status
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return latencies, time.perf_counter() - start
+
+
+def populate():
+    genres = Genre.objects.bulk_create(Genre(name="Genre %d" % i) for i in range(10))
+    users = User.objects.bulk_create(
+        User(email="user%d@example.com" % i, username="user%d" % i) for i in range(5)
+    )
+    movies = Movie.objects.bulk_create(
+        Movie(
+            name="Movie %d" % i,
+            release_date=date(2000, 1, 1) + timedelta(days=i),
+            rating=i % 10 + 1,
+        )
+        for i in range(200)
+    )
+    Movie.genre.through.objects.bulk_create(
+        Movie.genre.through(movie=movie, genre=genres[movie.id % len(genres)])
+        for movie in movies
+    )
+    Review.objects.bulk_create(
+        Review(user=user, movie=movie, description="Great")
+        for movie in movies
+        for user in users[:2]
+    )
+
+
+def main(clients=100, requests=5, delay=500):
+    delay = delay / 1e3
+    # responses would be served from the cache, not by the views
+    settings.CACHES["benchmark"] = {
+        "BACKEND": "django.core.cache.backends.dummy.DummyCache"
+    }
+    settings.MOVIE_RESPONSE_CACHE = "benchmark"
+    settings.ALLOWED_HOSTS = ["testserver"]
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        populate()
+        connection.close()
+        print(
+            "%d clients x %d requests, %d ms per response to the client, "
+            "%d WSGI threads" % (clients, requests, delay * 1e3, WSGI_THREADS)
+        )
+        print("%-14s %10s %10s %10s" % ("server", "req/s", "p50 ms", "p95 ms"))
+        sync_url, async_url = reverse("list-movies"), reverse("async-list-movies")
+        report("sync wsgi", *sync_wsgi(sync_url, clients, requests, delay))
+        report("sync asgi", *asyncio.run(asgi(sync_url, clients, requests, delay)))
+        report("async asgi", *asyncio.run(asgi(async_url, clients, requests, delay)))
+    finally:
+        connections.close_all()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
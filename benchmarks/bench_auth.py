@@ -0,0 +1,58 @@
+"""
+Compares the user query of JWTAuthentication with ClaimsJWTAuthentication
+and CachedUserJWTAuthentication. Runs against a throwaway test database,
+so migrations must have been made.
+
+    python -m benchmarks.bench_auth
+"""
+import timeit
+from benchmarks import setup
+
+setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+from rest_framework_simplejwt.authentication import JWTAuthentication  # noqa: E402
+from user.authentication import (  # noqa: E402
+    CachedUserJWTAuthentication,
+    ClaimsJWTAuthentication,
+)
+from user.models import User  # noqa: E402
+
+
+def main(number=5000):
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        user = User.objects.create_user(
+            email="user@example.com", username="user", password="Secret@123"
+        )
+        request = APIRequestFactory().get(
+            "/", HTTP_AUTHORIZATION="Bearer " + user.tokens()["access"]
+        )
+        print("%-30s %8s %12s" % ("authentication", "queries", "us/request"))
+        for authentication in (
+            JWTAuthentication(),
+            ClaimsJWTAuthentication(),
+            CachedUserJWTAuthentication(),
+        ):
+            authentication.authenticate(request)
+            with CaptureQueriesContext(connection) as queries:
+                authentication.authenticate(request)
+            seconds = timeit.timeit(
+                lambda: authentication.authenticate(request), number=number
+            )
+            print(
+                "%-30s %8d %12.1f"
+                % (
+                    authentication.__class__.__name__,
+                    len(queries),
+                    seconds / number * 1e6,
+                )
+            )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Movies and reviews written one per request against the same items sent to
+the batch endpoints, through the whole request stack. Every batch is one
+request and one transaction. Runs on a throwaway test database, so
+migrations must have been made.
+
+    python -m benchmarks.bench_batch [items] [batch size]
+"""
+import sys
+import time
+from datetime import date
+from benchmarks import setup
+
+setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from movie.models import Genre, Movie  # noqa: E402
+from user.models import User  # noqa: E402
+
+
+def movie_items(count, prefix):
+    return [
+        {
+            "name": "%s %d" % (prefix, i),
+            "release_date": "2001-01-01",
+            "rating": i % 11,
+            "genre": [{"name": "Genre %d" % (i % 10)}],
+        }
+        for i in range(count)
+    ]
+
+
+def review_items(count, prefix):
+    movies = Movie.objects.bulk_create(
+        Movie(name="%s %d" % (prefix, i), release_date=date(2000, 1, 1), rating=5)
+        for i in range(count)
+    )
+    return [{"movie": movie.id, "description": "Great"} for movie in movies]
+
+
+def one_per_request(client, url_name, items):
+    for item in items:
+        if url_name == "create-review":
+            url = reverse(url_name, kwargs={"pk": item["movie"]})
+            item = {"description": item["description"]}
+        else:
+            url = reverse(url_name)
+        response = client.post(url, item, format="json")
+        assert response.status_code == 201, response.content
+
+
+def batched(url_name, size):
+    def post(client, _, items):
+        for start in range(0, len(items), size):
+            response = client.post(
+                reverse(url_name), items[start : start + size], format="json"
+            )
+            assert response.status_code == 201, response.content
+
+    return post
+
+
+def run(name, write, client, url_name, items):
+    start = time.perf_counter()
+    write(client, url_name, items)
+    seconds = time.perf_counter() - start
+    print("%-26s %10.0f %10.2f" % (name, len(items) / seconds, seconds))
+
+
+def main(items=2000, size=100):
+    settings.ALLOWED_HOSTS = ["testserver"]
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        Genre.objects.bulk_create(Genre(name="Genre %d" % i) for i in range(10))
+        print("%d items, batches of %d, on %s" % (items, size, connection.vendor))
+        print("%-26s %10s %10s" % ("writes", "items/s", "seconds"))
+        for label, create, batch, make_items in (
+            ("movies", "create-movie", "batch-create-movies", movie_items),
+            ("reviews", "create-review", "batch-create-reviews", review_items),
+        ):
+            for mode, write, url_name in (
+                ("one per request", one_per_request, create),
+                ("batched", batched(batch, size), batch),
+            ):
+                # reviews are unique per user and movie
+                user = User.objects.create(
+                    email="%s%s@benchmark.local" % (label, mode.replace(" ", "")),
+                    username="%s %s" % (label, mode),
+                )
+                client = APIClient()
+                client.force_authenticate(user)
+                run(
+                    "%s %s" % (label, mode),
+                    write,
+                    client,
+                    url_name,
+                    make_items(items, "%s %s" % (label, mode)),
+                )
+    finally:
+        connection.close()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
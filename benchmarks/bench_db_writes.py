@@ -0,0 +1,126 @@
+"""
+Concurrent review writes, each one a request: a transaction that adds the
+review and updates the movie stats, then the end-of-request connection
+cleanup. Compares the database profiles of the configured engine on a
+throwaway test database, so migrations must have been made.
+
+    python -m benchmarks.bench_db_writes [threads] [writes per thread]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from benchmarks import setup
+
+setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import (  # noqa: E402
+    OperationalError,
+    close_old_connections,
+    connection,
+    connections,
+    transaction,
+)
+from movie.models import Movie, Review  # noqa: E402
+from movie.review_stats import review_added  # noqa: E402
+from user.models import User  # noqa: E402
+
+SQLITE_PROFILES = [
+    # sqlite's own defaults, rollback journal and a sync on every commit
+    ("sqlite default", {"journal_mode": "delete", "synchronous": "full"}, 0),
+    ("sqlite tuned", settings.SQLITE_PRAGMAS, 0),
+    ("sqlite tuned persistent", settings.SQLITE_PRAGMAS, 600),
+]
+POSTGRES_PROFILES = [
+    ("postgres", {}, 0),
+    ("postgres persistent", {}, 600),
+]
+
+
+def write_reviews(user, movies, writes, latencies, errors):
+    for i in range(writes):
+        start = time.perf_counter()
+        try:
+            with transaction.atomic():
+                review = Review.objects.create(
+                    user=user, movie=movies[i % len(movies)], description="Great"
+                )
+                review_added(review)
+        except OperationalError:
+            errors.append(1)
+        latencies.append(time.perf_counter() - start)
+        # what the request_finished signal does
+        close_old_connections()
+    connection.close()
+
+
+def run(name, pragmas, conn_max_age, users, movies, writes):
+    settings.SQLITE_PRAGMAS = pragmas
+    connections.settings["default"]["CONN_MAX_AGE"] = conn_max_age
+    connection.close()
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(
+            target=write_reviews, args=(user, movies, writes, latencies, errors)
+        )
+        for user in users
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    print(
+        "%-26s %10.0f %10.2f %10.2f %8d"
+        % (
+            name,
+            len(latencies) / seconds,
+            latencies[len(latencies) // 2] * 1e3,
+            latencies[int(len(latencies) * 0.95)] * 1e3,
+            len(errors),
+        )
+    )
+
+
+def main(threads=8, writes=200):
+    directory = tempfile.TemporaryDirectory()
+    if connection.vendor == "sqlite":
+        # wal needs a database file, the sqlite test database is in memory
+        name = os.path.join(directory.name, "bench.sqlite3")
+        connections.settings["default"]["TEST"]["NAME"] = name
+        profiles = SQLITE_PROFILES
+    else:
+        profiles = POSTGRES_PROFILES
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        users = User.objects.bulk_create(
+            User(email="user%d@example.com" % i, username="user%d" % i)
+            for i in range(threads)
+        )
+        movies = Movie.objects.bulk_create(
+            Movie(
+                name="Movie %d" % i,
+                release_date="2000-01-01",
+                rating=5,
+            )
+            for i in range(50)
+        )
+        print("%d threads x %d writes on %s" % (threads, writes, connection.vendor))
+        print(
+            "%-26s %10s %10s %10s %8s"
+            % ("profile", "writes/s", "p50 ms", "p95 ms", "errors")
+        )
+        for profile in profiles:
+            run(*profile, users, movies, writes)
+    finally:
+        connection.close()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        directory.cleanup()
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,67 @@
+"""
+Compares the single pass UserRenderer with the previous str()-and-scan one.
+
+    python -m benchmarks.bench_renderer
+"""
+import json
+import timeit
+from benchmarks import setup
+
+setup()
+
+from rest_framework.exceptions import ErrorDetail  # noqa: E402
+from rest_framework.response import Response  # noqa: E402
+from user.renderers import UserRenderer  # noqa: E402
+
+
+def legacy_render(data):
+    if "ErrorDetail" in str(data):
+        return json.dumps({"errors": data})
+    return json.dumps({"data": data})
+
+
+def profile(reviews):
+    return {
+        "id": 1,
+        "email": "user@example.com",
+        "username": "user",
+        "user_reviews": [
+            {
+                "id": i,
+                "user": 1,
+                "movie": i,
+                "description": "review text " * 10,
+                "created_at": "2023-01-01T00:00:00Z",
+                "updated_at": "2023-01-01T00:00:00Z",
+            }
+            for i in range(reviews)
+        ],
+    }
+
+
+def main():
+    renderer = UserRenderer()
+    errors = {"password": [ErrorDetail("This password is too short.", code="min")]}
+    print("%-24s %12s %12s %8s" % ("payload", "legacy us", "new us", "speedup"))
+    for name, data, status in [
+        ("error", errors, 400),
+        ("profile 10 reviews", profile(10), 200),
+        ("profile 1000 reviews", profile(1000), 200),
+        ("profile 10000 reviews", profile(10000), 200),
+    ]:
+        context = {"response": Response(data, status=status)}
+        number = max(1, 20000 // max(len(data.get("user_reviews", [])), 1))
+        legacy = timeit.timeit(lambda: legacy_render(data), number=number) / number
+        new = (
+            timeit.timeit(
+                lambda: renderer.render(data, renderer_context=context), number=number
+            )
+            / number
+        )
+        print(
+            "%-24s %12.1f %12.1f %7.2fx" % (name, legacy * 1e6, new * 1e6, legacy / new)
+        )
+
+
+if __name__ == "__main__":
+    main()
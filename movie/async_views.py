@@ -0,0 +1,153 @@
+from collections import defaultdict
+from django.db.models import F, Prefetch
+from django.db.models.functions import Lower
+from django.http import HttpResponse
+from django.views import View
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from .models import Genre
+from .serializers import MovieFilterSerializer
+from .views import ListGenresView, ListMoviesView, RetrieveGenreView, RetrieveMovieView
+
+
+async def aprefetch_related_objects(instances, lookups):
+    """
+    prefetch_related_objects() on the async ORM. Django's related managers
+    evaluate their prefetch querysets synchronously, so each relation is
+    fetched with one query filtered on the instances' ids instead. Handles
+    single level lookups of many-to-many and reverse foreign key relations,
+    names or Prefetch objects, like the ones of movie.sparse.
+    """
+    if not instances:
+        return
+    ids = [instance.pk for instance in instances]
+    for lookup in lookups:
+        if not isinstance(lookup, Prefetch):
+            lookup = Prefetch(lookup)
+        name = lookup.prefetch_through
+        field = instances[0]._meta.get_field(name)
+        if field.many_to_many and not field.auto_created:
+            path = field.related_query_name()
+        elif field.one_to_many:
+            path = field.field.name
+        else:
+            raise ValueError("Can't prefetch %r asynchronously." % name)
+        queryset = lookup.queryset
+        if queryset is None:
+            queryset = field.related_model._default_manager.all()
+        # the id of the instance each row belongs to, a join for many-to-many
+        queryset = queryset.annotate(_prefetch_for=F(path + "__pk"))
+        related = defaultdict(list)
+        async for obj in queryset.filter(_prefetch_for__in=ids).aiterator():
+            related[obj._prefetch_for].append(obj)
+        for instance in instances:
+            # what prefetch_related() leaves behind, the manager reads from it
+            queryset = getattr(instance, name).all()
+            queryset._result_cache = related[instance.pk]
+            queryset._prefetch_done = True
+            if not hasattr(instance, "_prefetched_objects_cache"):
+                instance._prefetched_objects_cache = {}
+            instance._prefetched_objects_cache[name] = queryset
+
+
+class AsyncReadView(View):
+    """
+    Native async variant of a public read view. The sync DRF view builds the
+    queryset, paginator and serializer as usual. The queries run on the async
+    ORM and everything is loaded before serialization, so the serializer
+    never queries. The response cache and conditional GET of the sync views
+    are left out, both are synchronous. Subclasses set view_class and define
+    async get_data(view, **kwargs), which returns the response data.
+    """
+
+    view_class = None
+
+    async def get(self, request, **kwargs):
+        view = self.view_class(
+            request=Request(request), args=(), kwargs=kwargs, format_kwarg=None
+        )
+        try:
+            data = await self.get_data(view, **kwargs)
+        except APIException as exc:
+            data = exc.detail
+            if not isinstance(data, (list, dict)):
+                data = {"detail": data}
+            return self.render(data, exc.status_code)
+        return self.render(data)
+
+    async def load(self, queryset):
+        lookups = queryset._prefetch_related_lookups
+        instances = [obj async for obj in queryset.prefetch_related(None).aiterator()]
+        await aprefetch_related_objects(instances, lookups)
+        return instances
+
+    def render(self, data, status=200):
+        # same bytes as the sync views
+        return HttpResponse(
+            JSONRenderer().render(data), status=status, content_type="application/json"
+        )
+
+
+class AsyncListGenresView(AsyncReadView):
+    view_class = ListGenresView
+
+    async def get_data(self, view):
+        genres = [genre async for genre in view.get_queryset().aiterator()]
+        return view.get_serializer(genres, many=True).data
+
+
+class AsyncRetrieveGenreView(AsyncReadView):
+    view_class = RetrieveGenreView
+
+    async def get_data(self, view, pk):
+        try:
+            genre = await view.get_queryset().aget(id=pk)
+        except Genre.DoesNotExist:
+            raise NotFound()
+        movies = await self.load(view.shape_queryset(genre.movies.all()))
+        return view.get_serializer(movies, many=True).data
+
+
+class GenreIdsListMoviesView(ListMoviesView):
+    # genre names are looked up beforehand by AsyncListMoviesView
+    genre_ids = {}
+
+    def get_genre_id(self, genre):
+        if isinstance(genre, int):
+            return genre
+        return self.genre_ids.get(genre.lower())
+
+
+class AsyncListMoviesView(AsyncReadView):
+    view_class = GenreIdsListMoviesView
+
+    async def get_data(self, view):
+        params = MovieFilterSerializer(data=view.request.query_params)
+        params.is_valid(raise_exception=True)
+        genre = params.validated_data.get("genre")
+        if isinstance(genre, str):
+            view.genre_ids = {
+                genre.lower(): await Genre.objects.annotate(lower_name=Lower("name"))
+                .filter(lower_name=genre.lower())
+                .values_list("id", flat=True)
+                .afirst()
+            }
+        queryset = view.filter_queryset(view.get_queryset())
+        lookups = queryset._prefetch_related_lookups
+        page = await view.paginator.apaginate_queryset(
+            queryset.prefetch_related(None), view.request, view=view
+        )
+        await aprefetch_related_objects(page, lookups)
+        serializer = view.get_serializer(page, many=True)
+        return view.paginator.get_paginated_response(serializer.data).data
+
+
+class AsyncRetrieveMovieView(AsyncReadView):
+    view_class = RetrieveMovieView
+
+    async def get_data(self, view, pk):
+        movies = await self.load(view.get_queryset().filter(id=pk))
+        if not movies:
+            raise NotFound()
+        return view.get_serializer(movies[0]).data
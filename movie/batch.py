@@ -0,0 +1,135 @@
+from django.conf import settings
+from django.db import transaction
+from rest_framework import serializers, status
+from .cache import invalidate
+from .importers import write_movies
+from .models import Movie, Review
+from .review_stats import reviews_added
+from .serializers import CreateUpdateMovieSerializer
+
+
+class BatchReviewSerializer(serializers.ModelSerializer):
+    # movies are looked up for the whole batch at once
+    movie = serializers.IntegerField()
+
+    class Meta:
+        model = Review
+        fields = ("movie", "description")
+
+
+class BatchResult:
+    def __init__(self, size):
+        self.results = [None] * size
+
+    def add_created(self, index, id):
+        self.results[index] = {"index": index, "status": 201, "id": id}
+
+    def add_error(self, index, errors):
+        self.results[index] = {"index": index, "status": 400, "errors": errors}
+
+    @property
+    def created(self):
+        return sum(result["status"] == 201 for result in self.results)
+
+    @property
+    def status_code(self):
+        if not self.created:
+            return status.HTTP_400_BAD_REQUEST
+        if self.created < len(self.results):
+            return status.HTTP_207_MULTI_STATUS
+        return status.HTTP_201_CREATED
+
+    def as_dict(self):
+        return {
+            "created": self.created,
+            "failed": len(self.results) - self.created,
+            "results": self.results,
+        }
+
+
+def batch_error(items):
+    """
+    Returns the error message of a request body that isn't a batch.
+    """
+    size = settings.MOVIE_BATCH_MAX_ITEMS
+    if not isinstance(items, list) or not 0 < len(items) <= size:
+        return "expected a list of 1 to %d items." % size
+    return None
+
+
+def create_movies(items):
+    """
+    Validates every item with CreateUpdateMovieSerializer, then inserts the
+    valid ones in one transaction like the importer does.
+    """
+    result = BatchResult(len(items))
+    parsed, indexes = [], []
+    for index, item in enumerate(items):
+        serializer = CreateUpdateMovieSerializer(data=item)
+        if not serializer.is_valid():
+            result.add_error(index, serializer.errors)
+            continue
+        data = dict(serializer.validated_data)
+        genres = [genre["name"] for genre in data.pop("genre")]
+        parsed.append((Movie(**data), genres))
+        indexes.append(index)
+    if parsed:
+        for index, movie in zip(indexes, write_movies(parsed)):
+            result.add_created(index, movie.id)
+    return result
+
+
+def create_reviews(user_id, items):
+    """
+    Validates every item, looks up the movies and the user's earlier reviews
+    of them with one query each, then inserts the valid reviews and updates
+    the review stats of their movies in one transaction.
+    """
+    result = BatchResult(len(items))
+    valid = []
+    for index, item in enumerate(items):
+        serializer = BatchReviewSerializer(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            result.add_error(index, serializer.errors)
+    movie_ids = {data["movie"] for index, data in valid}
+    existing = set(Movie.objects.filter(id__in=movie_ids).values_list("id", flat=True))
+    reviewed = set(
+        Review.objects.filter(user_id=user_id, movie_id__in=existing).values_list(
+            "movie_id", flat=True
+        )
+    )
+    reviews, indexes = [], []
+    for index, data in valid:
+        movie_id = data["movie"]
+        if movie_id not in existing:
+            result.add_error(index, {"movie": ["movie not found."]})
+        elif movie_id in reviewed:
+            # also a second review of the same movie in this batch
+            result.add_error(index, {"movie": ["movie already reviewed."]})
+        else:
+            reviewed.add(movie_id)
+            reviews.append(
+                Review(
+                    user_id=user_id, movie_id=movie_id, description=data["description"]
+                )
+            )
+            indexes.append(index)
+    if reviews:
+        with transaction.atomic():
+            reviews = Review.objects.bulk_create(reviews)
+            reviews_added(reviews)
+            movie_ids = [review.movie_id for review in reviews]
+            genre_ids = Movie.genre.through.objects.filter(
+                movie_id__in=movie_ids
+            ).values_list("genre_id", flat=True)
+            # bulk inserts send no signals, see movie.signals
+            invalidate(
+                ["movies"]
+                + ["movie:%s" % pk for pk in movie_ids]
+                + ["genre:%s" % pk for pk in set(genre_ids)]
+            )
+        for index, review in zip(indexes, reviews):
+            result.add_created(index, review.id)
+    return result
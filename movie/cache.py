@@ -0,0 +1,90 @@
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+# per process counters, see CacheStatsView
+stats = {"hits": 0, "misses": 0}
+
+
+def get_cache():
+    return caches[settings.MOVIE_RESPONSE_CACHE]
+
+
+def _tag_key(tag):
+    return "movie-cache:tag:%s" % tag
+
+
+def _tag_versions(cache, tags):
+    keys = [_tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # a fresh, time based version never matches entries cached before
+            # the tag was evicted
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def _bump(tags):
+    cache = get_cache()
+    for tag in tags:
+        try:
+            cache.incr(_tag_key(tag))
+        except ValueError:
+            cache.set(_tag_key(tag), time.time_ns(), None)
+
+
+def invalidate(tags):
+    """
+    Evicts every cached response carrying one of tags. Versions are bumped
+    right away and again after commit, so a response cached from a concurrent
+    read of the old rows doesn't outlive the transaction.
+    """
+    tags = list(tags)
+    if not tags:
+        return
+    _bump(tags)
+    transaction.on_commit(lambda: _bump(tags))
+
+
+def cache_stats():
+    total = stats["hits"] + stats["misses"]
+    return {
+        "hits": stats["hits"],
+        "misses": stats["misses"],
+        "hit_ratio": round(stats["hits"] / total, 4) if total else 0.0,
+    }
+
+
+class CachedResponseMixin:
+    """
+    Caches successful GET responses per absolute URL. cache_tags are
+    formatted with the url kwargs, e.g. "movie:{pk}", and the entry is evicted
+    by invalidate() of any of them, see movie.signals.
+    """
+
+    cache_tags = ()
+
+    def get(self, request, *args, **kwargs):
+        cache = get_cache()
+        tags = [tag.format(**kwargs) for tag in self.cache_tags]
+        versions = _tag_versions(cache, tags)
+        # pagination links are absolute, scheme and host are part of the key
+        url = request.build_absolute_uri()
+        key = (
+            "movie-cache:response:%s"
+            % hashlib.md5(("%s|%s" % (url, versions)).encode()).hexdigest()
+        )
+        data = cache.get(key)
+        if data is not None:
+            stats["hits"] += 1
+            return Response(data)
+        stats["misses"] += 1
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.MOVIE_RESPONSE_CACHE_TIMEOUT)
+        return response
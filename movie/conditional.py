@@ -0,0 +1,49 @@
+import hashlib
+from django.db.models import Count, Max
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from .models import Genre, Movie
+
+
+def movie_list_version(request, **kwargs):
+    # any insert, update or delete of a movie or genre changes the version
+    movies = Movie.objects.aggregate(updated_at=Max("updated_at"), count=Count("id"))
+    genres = Genre.objects.aggregate(updated_at=Max("updated_at"))
+    return [movies["updated_at"], genres["updated_at"]], movies["count"]
+
+
+def movie_version(request, pk, **kwargs):
+    movie = Movie.objects.filter(id=pk).aggregate(
+        updated_at=Max("updated_at"), genre_updated_at=Max("genre__updated_at")
+    )
+    return [movie["updated_at"], movie["genre_updated_at"]], pk
+
+
+def conditional_get(version_func):
+    """
+    Decorates the get() of a view with ETag and Last-Modified validators from
+    version_func, which returns (timestamps, extra) from a cheap aggregate
+    query. Matching If-None-Match/If-Modified-Since requests get a 304 before
+    the view runs.
+    """
+
+    def version(request, *args, **kwargs):
+        # both validators share one aggregate query per request
+        if not hasattr(request, "_movie_version"):
+            timestamps, extra = version_func(request, *args, **kwargs)
+            timestamps = [timestamp for timestamp in timestamps if timestamp]
+            request._movie_version = (
+                max(timestamps) if timestamps else None,
+                hashlib.md5(
+                    ("%s|%s|%s" % (request.get_full_path(), timestamps, extra)).encode()
+                ).hexdigest(),
+            )
+        return request._movie_version
+
+    return method_decorator(
+        condition(
+            etag_func=lambda *args, **kwargs: version(*args, **kwargs)[1],
+            last_modified_func=lambda *args, **kwargs: version(*args, **kwargs)[0],
+        ),
+        name="get",
+    )
@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.functions import Lower
+from .models import Genre
+
+# process-local lowercased genre name -> id, enabled with settings.MOVIE_GENRE_CACHE
+# and cleared by movie.signals whenever a Genre is saved or deleted
+_genre_id_cache = {}
+
+
+def clear_genre_cache():
+    _genre_id_cache.clear()
+
+
+def resolve_genre_ids(names, create=True):
+    """
+    Returns a dict mapping lowercased genre name to Genre id, creating the
+    missing genres unless create is False. Lookup is case-insensitive like
+    Genre.objects.get_or_create(name__iexact=...), existing genres keep their
+    spelling.
+    """
+    use_cache = getattr(settings, "MOVIE_GENRE_CACHE", False)
+    wanted = {}
+    for name in names:
+        # first spelling of a name wins for newly created genres
+        wanted.setdefault(name.lower(), name)
+    genre_ids = {}
+    if use_cache:
+        for key in wanted:
+            if key in _genre_id_cache:
+                genre_ids[key] = _genre_id_cache[key]
+        wanted = {key: name for key, name in wanted.items() if key not in genre_ids}
+    if not wanted:
+        return genre_ids
+
+    def existing():
+        return dict(
+            Genre.objects.annotate(lower_name=Lower("name"))
+            .filter(lower_name__in=wanted)
+            .values_list("lower_name", "id")
+        )
+
+    found = existing()
+    missing = [name for key, name in wanted.items() if key not in found]
+    if missing and create:
+        # ignore_conflicts keeps concurrent writers from failing on the unique name
+        Genre.objects.bulk_create(
+            [Genre(name=name) for name in missing], ignore_conflicts=True
+        )
+        found = existing()
+    if use_cache:
+        # ids of genres created in a rolled back transaction must not be cached
+        transaction.on_commit(lambda: _genre_id_cache.update(found))
+    genre_ids.update(found)
+    return genre_ids
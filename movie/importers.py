@@ -0,0 +1,162 @@
+import csv
+import io
+import json
+import time
+from datetime import date
+from itertools import islice
+from django.db import transaction
+from .cache import invalidate
+from .genres import resolve_genre_ids
+from .models import Movie
+
+# maximum number of row errors kept in an ImportResult
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportResult:
+    def __init__(self):
+        self.imported = 0
+        self.skipped = 0
+        self.errors = []
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        if not self.seconds:
+            return 0.0
+        return (self.imported + self.skipped) / self.seconds
+
+    def add_error(self, line, message):
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def as_dict(self):
+        return {
+            "imported": self.imported,
+            "skipped": self.skipped,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "errors": self.errors,
+        }
+
+
+def open_text(file):
+    """
+    Text file over a binary one. Bytes that aren't UTF-8 don't stop the
+    import, they are decoded to lone surrogates and parse_row() rejects the
+    rows that have them.
+    """
+    return io.TextIOWrapper(
+        file, encoding="utf-8", errors="surrogateescape", newline=""
+    )
+
+
+def read_rows(file, format):
+    """
+    Lazily yields (line, row) from a text file in "jsonl" or "csv" format.
+    csv files need a header with name, release_date, rating and genre columns,
+    multiple genres are separated with "|".
+    """
+    if format == "jsonl":
+        for line, text in enumerate(file, start=1):
+            if not text.strip():
+                continue
+            try:
+                yield line, json.loads(text)
+            except ValueError:
+                yield line, None
+    elif format == "csv":
+        # line 1 is the header
+        for line, row in enumerate(csv.DictReader(file), start=2):
+            yield line, row
+    else:
+        raise ValueError("Unsupported import format: %s" % format)
+
+
+def parse_row(row):
+    if not isinstance(row, dict):
+        raise ValueError("row is not an object")
+    try:
+        json.dumps(row, ensure_ascii=False).encode("utf-8")
+    except UnicodeEncodeError:
+        # see open_text()
+        raise ValueError("row is not valid UTF-8")
+    name = row.get("name") or ""
+    if not isinstance(name, str):
+        raise ValueError("name must be a string")
+    name = name.strip()
+    if not name or len(name) > 50:
+        raise ValueError("name is required and must be at most 50 characters")
+    release_date = date.fromisoformat(str(row.get("release_date") or ""))
+    rating = int(row.get("rating") or 0)
+    if not 0 <= rating <= 10:
+        raise ValueError("rating must be between 0 and 10")
+    genres = row.get("genre") or []
+    if isinstance(genres, str):
+        genres = genres.split("|")
+    genres = [
+        genre["name"] if isinstance(genre, dict) else str(genre) for genre in genres
+    ]
+    if not all(isinstance(genre, str) for genre in genres):
+        raise ValueError("genre names must be strings")
+    genres = [genre.strip() for genre in genres]
+    genres = [genre for genre in genres if genre]
+    if any(len(genre) > 50 for genre in genres):
+        raise ValueError("genre names must be at most 50 characters")
+    return Movie(name=name, release_date=release_date, rating=rating), genres
+
+
+def import_movies(rows, batch_size=1000):
+    """
+    Imports (line, row) pairs as returned by read_rows. Every batch is written
+    in one transaction with a bulk insert for movies and for the Movie.genre
+    through table, genres of the whole batch are resolved with one query.
+    """
+    result = ImportResult()
+    started = time.perf_counter()
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            break
+        parsed = []
+        for line, row in chunk:
+            try:
+                parsed.append(parse_row(row))
+            except (ValueError, TypeError, KeyError) as e:
+                result.add_error(line, str(e) or "invalid row")
+        if parsed:
+            write_movies(parsed)
+            result.imported += len(parsed)
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def write_movies(parsed):
+    """
+    Inserts (Movie, genre names) pairs in one transaction, creating missing
+    genres, and returns the movies with their ids.
+    """
+    Through = Movie.genre.through
+    with transaction.atomic():
+        genre_ids = resolve_genre_ids(
+            genre for movie, genres in parsed for genre in genres
+        )
+        movies = Movie.objects.bulk_create([movie for movie, genres in parsed])
+        links = {
+            (movie.id, genre_ids[genre.lower()])
+            for movie, (_, genres) in zip(movies, parsed)
+            for genre in genres
+        }
+        Through.objects.bulk_create(
+            [
+                Through(movie_id=movie_id, genre_id=genre_id)
+                for movie_id, genre_id in links
+            ]
+        )
+        # bulk inserts send no signals, genres may have been created too
+        invalidate(
+            ["movies", "genres"] + ["genre:%s" % pk for pk in set(genre_ids.values())]
+        )
+    return movies
@@ -0,0 +1,113 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from MovieAPI.benchmark import compare, report, run, seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database with fake data, request every movie and "
+        "user endpoint and report latency percentiles, queries and bytes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--genres", type=int, default=20)
+        parser.add_argument("--movies", type=int, default=1000)
+        parser.add_argument("--reviews", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument(
+            "--cached",
+            action="store_true",
+            help="keep the response cache between requests",
+        )
+        parser.add_argument(
+            "--route", action="append", dest="routes", help="only this route name"
+        )
+        parser.add_argument("--output", default="benchmark.json")
+        parser.add_argument("--baseline", help="report of an earlier run to compare")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=20.0,
+            help="p50/p95 increase in percent reported as a regression",
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["baseline"]:
+            with open(options["baseline"]) as file:
+                baseline = json.load(file)
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            catalog = seed(
+                users=options["users"],
+                genres=options["genres"],
+                movies=options["movies"],
+                reviews=options["reviews"],
+                seed=options["seed"],
+            )
+            results = run(
+                catalog,
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+                cached=options["cached"],
+                routes=options["routes"],
+            )
+            data = report(catalog, results, options["iterations"], options["cached"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        changes, regressions = {}, []
+        if baseline is not None:
+            changes, regressions = compare(results, baseline, options["threshold"])
+            data["baseline"] = options["baseline"]
+            data["changes"] = changes
+        with open(options["output"], "w") as file:
+            json.dump(data, file, indent=2)
+
+        self.stdout.write(
+            "%-30s %6s %9s %9s %9s %7s %9s %6s"
+            % (
+                "route",
+                "method",
+                "p50 ms",
+                "p95 ms",
+                "p99 ms",
+                "queries",
+                "bytes",
+                "errors",
+            )
+        )
+        for name, stats in results.items():
+            line = "%-30s %6s %9.2f %9.2f %9.2f %7d %9d %6d" % (
+                name,
+                stats["method"],
+                stats["p50_ms"],
+                stats["p95_ms"],
+                stats["p99_ms"],
+                stats["queries"],
+                stats["bytes"],
+                stats["errors"],
+            )
+            if name in changes:
+                change = changes[name]
+                line += "  p50 %+.1f%% p95 %+.1f%% queries %+d" % (
+                    change.get("p50_ms", 0),
+                    change.get("p95_ms", 0),
+                    change["queries"],
+                )
+            self.stdout.write(line)
+        self.stdout.write(self.style.SUCCESS("Wrote %s." % options["output"]))
+
+        errors = [name for name, stats in results.items() if stats["errors"]]
+        if errors:
+            self.stderr.write("Error responses from: %s" % ", ".join(errors))
+        if regressions:
+            raise CommandError("Regressions:\n%s" % "\n".join(regressions))
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from MovieAPI.schema import code_version, write_schema_file
+
+
+class Command(BaseCommand):
+    help = "Write the OpenAPI schema served by the docs routes to API_SCHEMA_FILE."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", help="defaults to settings.API_SCHEMA_FILE")
+
+    def handle(self, *args, **options):
+        path = options["output"] or settings.API_SCHEMA_FILE
+        content = write_schema_file(path)
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Wrote %d bytes of schema version %s to %s."
+                % (len(content), code_version(), path)
+            )
+        )
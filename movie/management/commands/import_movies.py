@@ -0,0 +1,45 @@
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from movie.importers import import_movies, open_text, read_rows
+
+
+class Command(BaseCommand):
+    help = "Bulk import movies from a JSONL or CSV file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="path of the file to import")
+        parser.add_argument(
+            "--format",
+            choices=["jsonl", "csv"],
+            help="file format, defaults to the file extension",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        format = options["format"] or path.suffix.lstrip(".").lower()
+        if format == "json":
+            format = "jsonl"
+        if format not in ("jsonl", "csv"):
+            raise CommandError("Unknown format, use --format jsonl or --format csv.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        with open_text(open(path, "rb")) as file:
+            result = import_movies(
+                read_rows(file, format), batch_size=options["batch_size"]
+            )
+
+        for error in result.errors:
+            self.stderr.write("line %(line)s: %(error)s" % error)
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Imported %d movies, skipped %d rows in %.2fs (%.0f rows/s)."
+                % (
+                    result.imported,
+                    result.skipped,
+                    result.seconds,
+                    result.rows_per_second,
+                )
+            )
+        )
@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from movie.cache import invalidate
+from movie.models import Movie
+from movie.review_stats import actual_review_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild Movie.review_count and Movie.last_reviewed_at from reviews."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="only report drifted movies, exit with an error if there are any",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id = 0
+        checked = drifted = 0
+        while True:
+            # walk the table by primary key ranges so every batch is an index scan
+            movies = Movie.objects.filter(id__gt=last_id).order_by("id")
+            movies = list(
+                movies.only("id", "review_count", "last_reviewed_at")[:batch_size]
+            )
+            if not movies:
+                break
+            last_id = movies[-1].id
+            actual = actual_review_stats(
+                Movie.objects.filter(id__gte=movies[0].id, id__lte=last_id)
+            )
+            stale = []
+            for movie in movies:
+                if (movie.review_count, movie.last_reviewed_at) != actual[movie.id]:
+                    count, last_reviewed_at = actual[movie.id]
+                    self.stdout.write(
+                        "movie %d: review_count %d -> %d, last_reviewed_at %s -> %s"
+                        % (
+                            movie.id,
+                            movie.review_count,
+                            count,
+                            movie.last_reviewed_at,
+                            last_reviewed_at,
+                        )
+                    )
+                    movie.review_count = count
+                    movie.last_reviewed_at = last_reviewed_at
+                    movie.updated_at = timezone.now()
+                    stale.append(movie)
+            checked += len(movies)
+            drifted += len(stale)
+            if stale and not options["check"]:
+                with transaction.atomic():
+                    Movie.objects.bulk_update(
+                        stale, ["review_count", "last_reviewed_at", "updated_at"]
+                    )
+                invalidate(["movies"] + ["movie:%s" % movie.id for movie in stale])
+
+        if options["check"] and drifted:
+            raise CommandError("%d of %d movies have drifted." % (drifted, checked))
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Checked %d movies, %s %d."
+                % (checked, "found" if options["check"] else "fixed", drifted)
+            )
+        )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from movie.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the movie search index from movies and reviews."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        backend = get_search_backend(options["database"])
+        backend.install(options["database"])
+        backend.rebuild(options["database"])
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
@@ -4,6 +4,7 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 
 class Genre(models.Model):
     name = models.CharField(max_length=50, unique=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.name
@@ -16,6 +17,23 @@ class Movie(models.Model):
     rating = models.IntegerField(
         blank=True, default=0, validators=[MinValueValidator(0), MaxValueValidator(10)]
     )
+    # maintained by the review views, see movie.review_stats
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    last_reviewed_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # also bumped when a review or the genres of the movie change, see movie.signals
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # keyset pagination orderings, see movie.pagination
+            models.Index(
+                fields=["release_date", "id"], name="movie_release_date_id_idx"
+            ),
+            models.Index(fields=["rating", "id"], name="movie_rating_id_idx"),
+            models.Index(
+                fields=["review_count", "id"], name="movie_review_count_id_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -32,5 +50,13 @@ class Review(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # reviews of a movie, newest first, see movie.pagination
+            models.Index(
+                fields=["movie", "created_at", "id"], name="review_movie_created_idx"
+            ),
+        ]
+
     def __str__(self):
         return str(self.id)
@@ -0,0 +1,136 @@
+import json
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    CursorPagination keeps only the first ordering field in the cursor and
+    skips its ties with OFFSET. Here the cursor holds the value of every
+    ordering field, the last one unique, and pages are filtered with a row
+    comparison, so every page is a range scan of the matching index.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        paginate_queryset() for the async views, the page is fetched with the
+        async ORM. Next and previous links are built by the sync methods.
+        """
+        queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page([instance async for instance in queryset.aiterator()])
+
+    def get_page_queryset(self, queryset, request, view):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if current_position is not None:
+            try:
+                queryset = queryset.filter(self.after(current_position, reverse))
+            except (TypeError, ValueError, ValidationError):
+                # a position that isn't json or doesn't match the field types
+                raise NotFound(self.invalid_cursor_message)
+        self.offset = offset
+        self.reverse = reverse
+        self.current_position = current_position
+        # one extra item tells if there is a following page
+        return queryset[offset : offset + self.page_size + 1]
+
+    def after(self, position, reverse):
+        """
+        Rows past position in the query order, e.g. for ("-rating", "-id")
+        rating <= r AND (rating < r OR (rating = r AND id < i)). The first
+        bound lets the database seek on the leading index column.
+        """
+        values = json.loads(position)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise ValueError("position doesn't match the ordering")
+        fields = []
+        for order in self.ordering:
+            # (cursor reversed) XOR (field descending)
+            fields.append((order.lstrip("-"), reverse != order.startswith("-")))
+        condition = Q()
+        equal = Q()
+        for (field, descending), value in zip(fields, values):
+            lookup = "__lt" if descending else "__gt"
+            condition |= equal & Q(**{field + lookup: value})
+            equal &= Q(**{field: value})
+        field, descending = fields[0]
+        lookup = "__lte" if descending else "__gte"
+        return Q(**{field + lookup: values[0]}) & condition
+
+    def set_page(self, results):
+        self.page = results[: self.page_size]
+        following_position = None
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        current_position = self.current_position
+        has_current_position = current_position is not None or self.offset > 0
+        if self.reverse:
+            self.page.reverse()
+            self.has_next, self.next_position = has_current_position, current_position
+            self.has_previous = following_position is not None
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.next_position = following_position
+            self.has_previous = has_current_position
+            self.previous_position = current_position
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for order in ordering:
+            field = order.lstrip("-")
+            value = (
+                instance[field]
+                if isinstance(instance, dict)
+                else getattr(instance, field)
+            )
+            values.append(str(value))
+        # ascii only, the cursor is base64 of an ascii query string
+        return json.dumps(values, separators=(",", ":"))
+
+
+class MovieCursorPagination(KeysetCursorPagination):
+    # keyset pagination, each page is a range scan on the matching index of Movie
+    ordering = ("-release_date", "-id")
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if "id" not in [order.lstrip("-") for order in ordering]:
+            # id breaks ties in the same direction, matching the (field, id)
+            # indexes, and makes every cursor position unique
+            last = ordering[-1]
+            ordering = ordering + ("-id" if last.startswith("-") else "id",)
+        return ordering
+
+
+class ReviewCursorPagination(KeysetCursorPagination):
+    # newest first, served by the (movie, created_at, id) index of Review
+    ordering = ("-created_at", "-id")
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
@@ -0,0 +1,59 @@
+from collections import Counter
+from django.db.models import Count, F, Max, OuterRef, Subquery
+from django.utils import timezone
+from .models import Movie, Review
+
+
+def latest_review_at():
+    return Subquery(
+        Review.objects.filter(movie=OuterRef("pk"))
+        .order_by("-updated_at")
+        .values("updated_at")[:1]
+    )
+
+
+def review_added(review):
+    Movie.objects.filter(id=review.movie_id).update(
+        review_count=F("review_count") + 1, last_reviewed_at=review.updated_at
+    )
+
+
+def reviews_added(reviews):
+    """
+    review_added() for reviews inserted with bulk_create, one update per
+    distinct number of new reviews of a movie.
+    """
+    counts = Counter(review.movie_id for review in reviews)
+    for count in set(counts.values()):
+        Movie.objects.filter(
+            id__in=[movie_id for movie_id, n in counts.items() if n == count]
+        ).update(
+            review_count=F("review_count") + count,
+            last_reviewed_at=latest_review_at(),
+            # bulk inserts send no signals, see movie.signals.touch_reviewed_movie
+            updated_at=timezone.now(),
+        )
+
+
+def review_updated(review):
+    Movie.objects.filter(id=review.movie_id).update(last_reviewed_at=review.updated_at)
+
+
+def review_deleted(review):
+    Movie.objects.filter(id=review.movie_id).update(
+        review_count=F("review_count") - 1, last_reviewed_at=latest_review_at()
+    )
+
+
+def actual_review_stats(movies):
+    """
+    Returns {movie id: (review_count, last_reviewed_at)} computed from the
+    Review table for the given Movie queryset.
+    """
+    return {
+        movie["id"]: (movie["actual_count"], movie["actual_last"])
+        for movie in movies.annotate(
+            actual_count=Count("movie_reviews"),
+            actual_last=Max("movie_reviews__updated_at"),
+        ).values("id", "actual_count", "actual_last")
+    }
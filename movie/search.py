@@ -0,0 +1,186 @@
+import re
+from django.conf import settings
+from django.db import connections
+from django.db.models import F, Max
+from django.utils.module_loading import import_string
+from .models import Movie, Review
+
+# weight of a movie name match relative to a review description match
+NAME_WEIGHT = 10.0
+
+
+def query_terms(q):
+    return re.findall(r"\w+", q.lower())
+
+
+class SQLiteSearchBackend:
+    """
+    FTS5 index over Movie.name and Review.description kept in sync by
+    triggers, so bulk inserts and queryset updates are indexed too. Movies
+    are stored at rowid 2 * id and reviews at 2 * id + 1, results are
+    ranked by the best BM25 score of the movie or any of its reviews.
+    """
+
+    table = "movie_search"
+
+    def install(self, using="default"):
+        movie = Movie._meta.db_table
+        review = Review._meta.db_table
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                [self.table],
+            )
+            exists = cursor.fetchone() is not None
+            if not exists:
+                cursor.execute(
+                    "CREATE VIRTUAL TABLE %s USING fts5("
+                    "name, description, movie_id UNINDEXED, prefix='2 3')" % self.table
+                )
+            for statement in (
+                "CREATE TRIGGER IF NOT EXISTS {search}_movie_ai "
+                "AFTER INSERT ON {movie} "
+                "BEGIN INSERT INTO {search}(rowid, name, description, movie_id) "
+                "VALUES (new.id * 2, new.name, '', new.id); END",
+                "CREATE TRIGGER IF NOT EXISTS {search}_movie_au "
+                "AFTER UPDATE OF name ON {movie} "
+                "BEGIN UPDATE {search} SET name = new.name "
+                "WHERE rowid = new.id * 2; END",
+                "CREATE TRIGGER IF NOT EXISTS {search}_movie_ad "
+                "AFTER DELETE ON {movie} "
+                "BEGIN DELETE FROM {search} WHERE rowid = old.id * 2; END",
+                "CREATE TRIGGER IF NOT EXISTS {search}_review_ai "
+                "AFTER INSERT ON {review} "
+                "BEGIN INSERT INTO {search}(rowid, name, description, movie_id) "
+                "VALUES (new.id * 2 + 1, '', new.description, new.movie_id); END",
+                "CREATE TRIGGER IF NOT EXISTS {search}_review_au "
+                "AFTER UPDATE OF description, movie_id ON {review} "
+                "BEGIN UPDATE {search} "
+                "SET description = new.description, movie_id = new.movie_id "
+                "WHERE rowid = new.id * 2 + 1; END",
+                "CREATE TRIGGER IF NOT EXISTS {search}_review_ad "
+                "AFTER DELETE ON {review} "
+                "BEGIN DELETE FROM {search} WHERE rowid = old.id * 2 + 1; END",
+            ):
+                cursor.execute(
+                    statement.format(search=self.table, movie=movie, review=review)
+                )
+            if not exists:
+                self.populate(cursor)
+
+    def prepare_connection(self, connection):
+        # FTS5 loads its index structure on first use in a connection. Inside
+        # a write transaction that read can't wait for the lock and fails with
+        # "database is locked" when writers race, so load it up front
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                [self.table],
+            )
+            if cursor.fetchone() is not None:
+                cursor.execute(
+                    "SELECT 1 FROM {search} WHERE {search} MATCH 'warmup' "
+                    "LIMIT 1".format(search=self.table)
+                )
+
+    def populate(self, cursor):
+        cursor.execute(
+            "INSERT INTO {search}(rowid, name, description, movie_id) "
+            "SELECT id * 2, name, '', id FROM {movie}".format(
+                search=self.table, movie=Movie._meta.db_table
+            )
+        )
+        cursor.execute(
+            "INSERT INTO {search}(rowid, name, description, movie_id) "
+            "SELECT id * 2 + 1, '', description, movie_id FROM {review}".format(
+                search=self.table, review=Review._meta.db_table
+            )
+        )
+
+    def rebuild(self, using="default"):
+        with connections[using].cursor() as cursor:
+            cursor.execute("DELETE FROM %s" % self.table)
+            self.populate(cursor)
+
+    def search(self, q, offset, limit, using="default"):
+        terms = query_terms(q)
+        if not terms:
+            return []
+        # every term must match, as a prefix of a word
+        match = " ".join('"%s"*' % term for term in terms)
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                # bm25() can't be used in an aggregate, the materialized CTE
+                # keeps sqlite from flattening it into the GROUP BY
+                "WITH hits AS MATERIALIZED ("
+                "SELECT movie_id, bm25({search}, %s, 1.0) AS score "
+                "FROM {search} WHERE {search} MATCH %s) "
+                "SELECT movie_id, MIN(score) AS best FROM hits "
+                "GROUP BY movie_id ORDER BY best, movie_id "
+                "LIMIT %s OFFSET %s".format(search=self.table),
+                [NAME_WEIGHT, match, limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend:
+    """
+    tsvector search computed at query time. Add GIN indexes on
+    to_tsvector('simple', name) and to_tsvector('simple', description) to
+    keep it fast on large tables.
+    """
+
+    config = "simple"
+
+    def install(self, using="default"):
+        pass
+
+    def prepare_connection(self, connection):
+        pass
+
+    def rebuild(self, using="default"):
+        pass
+
+    def search(self, q, offset, limit, using="default"):
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+        terms = query_terms(q)
+        if not terms:
+            return []
+        query = SearchQuery(
+            " & ".join("%s:*" % term for term in terms),
+            config=self.config,
+            search_type="raw",
+        )
+        window = offset + limit
+        movies = (
+            Movie.objects.using(using)
+            .annotate(vector=SearchVector("name", config=self.config))
+            .filter(vector=query)
+            .annotate(rank=SearchRank(F("vector"), query) * NAME_WEIGHT)
+            .order_by("-rank", "id")
+            .values_list("id", "rank")[:window]
+        )
+        reviews = (
+            Review.objects.using(using)
+            .annotate(vector=SearchVector("description", config=self.config))
+            .filter(vector=query)
+            .values("movie_id")
+            .annotate(rank=Max(SearchRank(F("vector"), query)))
+            .order_by("-rank", "movie_id")
+            .values_list("movie_id", "rank")[:window]
+        )
+        # the top window of the union is within the top window of each side
+        ranks = {}
+        for movie_id, rank in list(movies) + list(reviews):
+            ranks[movie_id] = max(rank, ranks.get(movie_id, rank))
+        ranked = sorted(ranks, key=lambda movie_id: (-ranks[movie_id], movie_id))
+        return ranked[offset:window]
+
+
+def get_search_backend(using="default"):
+    if settings.MOVIE_SEARCH_BACKEND:
+        return import_string(settings.MOVIE_SEARCH_BACKEND)()
+    if connections[using].vendor == "postgresql":
+        return PostgresSearchBackend()
+    return SQLiteSearchBackend()
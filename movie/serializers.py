@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from .genres import resolve_genre_ids
 from .models import Genre, Movie, Review
 
 
@@ -37,6 +38,29 @@ class MovieSerializer(serializers.ModelSerializer):
         model = Movie
         fields = "__all__"
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # sparse fieldset of the request, see movie.sparse
+        fields = self.context.get("fields")
+        if fields is not None:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+
+class MovieFilterSerializer(serializers.Serializer):
+    # query parameters of ListMoviesView, genre is a genre id or name
+    genre = serializers.CharField(required=False)
+    release_date_after = serializers.DateField(required=False)
+    release_date_before = serializers.DateField(required=False)
+    rating_min = serializers.IntegerField(required=False, min_value=0, max_value=10)
+    rating_max = serializers.IntegerField(required=False, min_value=0, max_value=10)
+
+    def validate_genre(self, value):
+        # ascii digits are an id, anything else, e.g. "²", is a name
+        if value.isascii() and value.isdigit():
+            return serializers.IntegerField(max_value=2**63 - 1).run_validation(value)
+        return value
+
 
 class CreateUpdateMovieSerializer(serializers.ModelSerializer):
     # separate serializer to create/update movies without providing reviews
@@ -47,20 +71,17 @@ class CreateUpdateMovieSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
     def create(self, validated_data):
-        genres = validated_data.pop("genre")[0]
+        genres = resolve_genre_ids(
+            genre["name"] for genre in validated_data.pop("genre")
+        )
         movie = Movie.objects.create(**validated_data)
         # m2m fields are set after obj is created
-        for genre in genres.values():
-            genre_obj, created = Genre.objects.get_or_create(
-                name__iexact=genre, defaults={"name": genre}
-            )
-            movie.genre.add(genre_obj)
+        movie.genre.add(*genres.values())
 
         return movie
 
     def update(self, instance, validated_data):
         fields = ["name", "release_date", "rating"]
-        movie_genres = instance.genre.all()
 
         for field in fields:
             try:
@@ -68,15 +89,14 @@ class CreateUpdateMovieSerializer(serializers.ModelSerializer):
             except KeyError:  # validated_data may not contain all fields during HTTP PATCH
                 pass
         try:
-            genres = validated_data.pop("genre")[0]
-            for genre in genres.values():
-                genre_obj, created = Genre.objects.get_or_create(
-                    name__iexact=genre, defaults={"name": genre}
-                )
-                if movie_genres.filter(name__iexact=genre).exists():
-                    instance.genre.remove(genre_obj)
-                else:
-                    instance.genre.add(genre_obj)
+            genres = resolve_genre_ids(
+                genre["name"] for genre in validated_data.pop("genre")
+            )
+            # genres already on the movie are toggled off, the others are added
+            movie_genres = set(instance.genre.values_list("id", flat=True))
+            requested = set(genres.values())
+            instance.genre.remove(*(requested & movie_genres))
+            instance.genre.add(*(requested - movie_genres))
         except KeyError:
             pass
 
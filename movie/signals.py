@@ -0,0 +1,124 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+)
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.utils import timezone
+from .cache import invalidate
+from .genres import clear_genre_cache
+from .models import Genre, Movie, Review
+from .search import get_search_backend
+
+
+def movie_genre_ids(movie_id):
+    return list(
+        Movie.genre.through.objects.filter(movie_id=movie_id).values_list(
+            "genre_id", flat=True
+        )
+    )
+
+
+def movie_tags(movie_id, genre_ids):
+    return ["movies", "movie:%s" % movie_id] + ["genre:%s" % pk for pk in genre_ids]
+
+
+@receiver([post_save, post_delete], sender=Genre)
+def invalidate_genre_cache(sender, **kwargs):
+    clear_genre_cache()
+
+
+@receiver(pre_delete, sender=Genre)
+def remember_genre_movies(sender, instance, **kwargs):
+    # through rows are gone by the time post_delete is sent
+    instance._movie_ids = list(instance.movies.values_list("id", flat=True))
+
+
+@receiver([post_save, post_delete], sender=Genre)
+def invalidate_genre_responses(sender, instance, created=False, **kwargs):
+    if created:
+        movie_ids = []
+    elif hasattr(instance, "_movie_ids"):
+        movie_ids = instance._movie_ids
+    else:
+        movie_ids = instance.movies.values_list("id", flat=True)
+    # genre names are embedded in every movie of the genre
+    invalidate(
+        ["genres", "movies", "genre:%s" % instance.pk]
+        + ["movie:%s" % pk for pk in movie_ids]
+    )
+
+
+@receiver(pre_delete, sender=Movie)
+def remember_movie_genres(sender, instance, **kwargs):
+    # through rows are gone by the time post_delete is sent
+    instance._genre_ids = movie_genre_ids(instance.pk)
+
+
+@receiver(post_save, sender=Movie)
+def invalidate_saved_movie_responses(sender, instance, **kwargs):
+    invalidate(movie_tags(instance.pk, movie_genre_ids(instance.pk)))
+
+
+@receiver(post_delete, sender=Movie)
+def invalidate_deleted_movie_responses(sender, instance, **kwargs):
+    invalidate(movie_tags(instance.pk, getattr(instance, "_genre_ids", [])))
+
+
+def touch_movies(movie_ids):
+    Movie.objects.filter(id__in=movie_ids).update(updated_at=timezone.now())
+
+
+@receiver([post_save, post_delete], sender=Review)
+def touch_reviewed_movie(sender, instance, **kwargs):
+    touch_movies([instance.movie_id])
+
+
+@receiver([post_save, post_delete], sender=Review)
+def invalidate_review_responses(sender, instance, **kwargs):
+    invalidate(movie_tags(instance.movie_id, movie_genre_ids(instance.movie_id)))
+
+
+@receiver(m2m_changed, sender=Movie.genre.through)
+def invalidate_movie_genre_responses(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action == "pre_clear":
+        instance._cleared_ids = (
+            list(instance.genre.values_list("id", flat=True))
+            if not reverse
+            else list(instance.movies.values_list("id", flat=True))
+        )
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if action == "post_clear":
+        pk_set = getattr(instance, "_cleared_ids", [])
+    # reverse is True when the relation is changed from the Genre side
+    if reverse:
+        movie_ids, genre_ids = pk_set, [instance.pk]
+    else:
+        movie_ids, genre_ids = [instance.pk], pk_set
+    touch_movies(movie_ids)
+    invalidate(
+        ["movies"]
+        + ["movie:%s" % pk for pk in movie_ids]
+        + ["genre:%s" % pk for pk in genre_ids]
+    )
+
+
+@receiver(post_migrate)
+def install_search_index(sender, using, **kwargs):
+    if sender.name == "movie":
+        get_search_backend(using).install(using)
+
+
+@receiver(connection_created)
+def prepare_search_connection(sender, connection, **kwargs):
+    # runs after the project wide tuning of MovieAPI.database
+    if connection.vendor != "sqlite":
+        return
+    get_search_backend(connection.alias).prepare_connection(connection)
@@ -0,0 +1,71 @@
+from rest_framework.exceptions import ValidationError
+from .models import Movie
+
+# ?expand= names of the MovieSerializer relations
+EXPANSIONS = {"genre": "genre", "reviews": "movie_reviews"}
+
+
+def split_param(value):
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+class SparseMovieMixin:
+    """
+    ?fields=id,name limits the MovieSerializer output to the listed fields
+    and ?expand=genre,reviews embeds the listed relations. Without either
+    parameter the whole movie is returned. The queryset loads only the
+    requested columns and prefetches only the expanded relations.
+    """
+
+    # columns always loaded, e.g. the ones pagination reads from instances
+    required_fields = ()
+
+    def get_movie_fields(self):
+        if not hasattr(self, "_movie_fields"):
+            self._movie_fields = self.parse_movie_fields()
+        return self._movie_fields
+
+    def parse_movie_fields(self):
+        if getattr(self, "swagger_fake_view", False):
+            # the schema documents the default shape
+            return None
+        params = self.request.query_params
+        if "fields" not in params and "expand" not in params:
+            return None
+        columns = [field.name for field in Movie._meta.concrete_fields]
+        relations = list(EXPANSIONS.values())
+        fields = split_param(params.get("fields", "")) or columns
+        unknown = set(fields) - set(columns) - set(relations)
+        if unknown:
+            raise ValidationError(
+                {"fields": "Unknown fields: %s." % ", ".join(sorted(unknown))}
+            )
+        expand = split_param(params.get("expand", ""))
+        unknown = set(expand) - set(EXPANSIONS)
+        if unknown:
+            raise ValidationError(
+                {"expand": "Unknown relations: %s." % ", ".join(sorted(unknown))}
+            )
+        # relations are only embedded on request once the shape is customized
+        fields = [field for field in fields if field not in relations]
+        return set(fields) | {EXPANSIONS[name] for name in expand}
+
+    def shape_queryset(self, queryset):
+        fields = self.get_movie_fields()
+        relations = list(EXPANSIONS.values())
+        if fields is None:
+            expanded = relations
+        else:
+            expanded = [name for name in relations if name in fields]
+            columns = fields - set(relations)
+            queryset = queryset.only("id", *columns, *self.required_fields)
+        return queryset.prefetch_related(*map(self.get_prefetch, expanded))
+
+    def get_prefetch(self, relation):
+        # a lookup or Prefetch object for an expanded relation
+        return relation
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"] = self.get_movie_fields()
+        return context
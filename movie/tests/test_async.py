@@ -0,0 +1,80 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.base import BaseHandler
+from django.urls import reverse
+from rest_framework import status
+from ..models import Genre
+from .utils import CatalogFactory, MovieAPITestCase
+
+
+class AsyncReadTests(MovieAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.drama = Genre.objects.create(name="Drama")
+        self.crime = Genre.objects.create(name="Crime")
+        self.movies = CatalogFactory.movies(5, genres=[self.drama], reviews=2)
+        self.movies += CatalogFactory.movies(2, genres=[self.crime])
+
+    async def assertSameAsSync(self, name, params="", **kwargs):
+        # any query in serialization would raise SynchronousOnlyOperation
+        response = await self.async_client.get(
+            reverse("async-" + name, kwargs=kwargs) + params
+        )
+        sync_response = await sync_to_async(self.client.get)(
+            reverse(name, kwargs=kwargs) + params
+        )
+        self.assertEqual(response.status_code, sync_response.status_code)
+        # pagination links point at the endpoint that was called
+        self.assertEqual(
+            response.content.replace(b"/movie/async/", b"/movie/"),
+            sync_response.content,
+        )
+        return response
+
+    async def test_genres(self):
+        await self.assertSameAsSync("list-genres")
+        await self.assertSameAsSync("retrieve-genre", pk=self.drama.id)
+        await self.assertSameAsSync(
+            "retrieve-genre", "?fields=id,name&expand=genre", pk=self.crime.id
+        )
+
+    async def test_movie(self):
+        await self.assertSameAsSync("retrieve-movie", pk=self.movies[0].id)
+        await self.assertSameAsSync(
+            "retrieve-movie", "?expand=reviews", pk=self.movies[0].id
+        )
+        response = await self.async_client.get(
+            reverse("async-retrieve-movie", kwargs={"pk": 0})
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_movie_list(self):
+        for params in (
+            "",
+            "?page_size=2",
+            "?genre=crime",
+            "?genre=%d" % self.drama.id,
+            "?genre=unknown",
+            "?genre=%C2%B2",
+            "?genre=" + "9" * 30,
+            "?ordering=rating&rating_min=3",
+            "?fields=id,name&expand=genre",
+            "?fields=unknown",
+            "?rating_min=11",
+        ):
+            await self.assertSameAsSync("list-movies", params)
+
+    async def test_movie_list_pages(self):
+        for params in ("?page_size=3", "?ordering=rating&page_size=2"):
+            response = await self.assertSameAsSync("list-movies", params)
+            next_url = response.json()["next"]
+            while next_url:
+                params = "?" + next_url.split("?", 1)[1]
+                response = await self.assertSameAsSync("list-movies", params)
+                next_url = response.json()["next"]
+            previous_url = response.json()["previous"]
+            await self.assertSameAsSync("list-movies", "?" + previous_url.split("?")[1])
+
+    def test_middleware_chain_stays_async(self):
+        # a sync only middleware would run every request in a thread
+        with self.assertNoLogs("django.request", "DEBUG"):
+            BaseHandler().load_middleware(is_async=True)
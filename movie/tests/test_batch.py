@@ -0,0 +1,163 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from ..models import Genre, Movie, Review
+from .utils import CatalogFactory, MovieAPITestCase
+
+
+class BatchCreateMoviesTests(MovieAPITestCase):
+    batch_url = reverse("batch-create-movies")
+
+    def setUp(self):
+        super().setUp()
+        Genre.objects.create(name="Horror")
+        self.client.force_authenticate(CatalogFactory.user())
+
+    def movie(self, name, genres=("Horror",)):
+        return {
+            "name": name,
+            "release_date": "1979-05-25",
+            "rating": 8,
+            "genre": [{"name": genre} for genre in genres],
+        }
+
+    def test_create(self):
+        response = self.client.post(
+            self.batch_url,
+            [self.movie("Alien", ["horror", "Sci-Fi"]), self.movie("Heat", [])],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 2)
+        alien = Movie.objects.get(name="Alien")
+        self.assertEqual(response.data["results"][0]["id"], alien.id)
+        # existing genre is matched case-insensitively
+        self.assertEqual(
+            sorted(alien.genre.values_list("name", flat=True)), ["Horror", "Sci-Fi"]
+        )
+        self.assertEqual(Genre.objects.count(), 2)
+
+    def test_invalid_items_are_reported(self):
+        response = self.client.post(
+            self.batch_url,
+            [self.movie("Alien"), {"name": "", "release_date": "01/01/2000"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["failed"], 1)
+        result = response.data["results"][1]
+        self.assertEqual((result["index"], result["status"]), (1, 400))
+        self.assertIn("release_date", result["errors"])
+        self.assertEqual(Movie.objects.count(), 1)
+
+        response = self.client.post(self.batch_url, [{}], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["failed"], 1)
+
+    @override_settings(MOVIE_BATCH_MAX_ITEMS=2)
+    def test_batch_size(self):
+        for data in ([], {"name": "Alien"}, [self.movie("Alien")] * 3):
+            response = self.client.post(self.batch_url, data, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("error", response.data)
+        self.assertFalse(Movie.objects.exists())
+
+    def test_queries_do_not_grow_with_batch(self):
+        def count(size):
+            items = [self.movie("Movie %d %d" % (size, i)) for i in range(size)]
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(self.batch_url, items, format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            return len(context)
+
+        self.assertEqual(count(2), count(20))
+
+    def test_evicts_cached_responses(self):
+        self.client.get(reverse("list-movies"))
+        self.client.post(self.batch_url, [self.movie("Alien")], format="json")
+        response = self.client.get(reverse("list-movies"))
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+        response = self.client.post(
+            self.batch_url, [self.movie("Alien")], format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class BatchCreateReviewsTests(MovieAPITestCase):
+    batch_url = reverse("batch-create-reviews")
+
+    def setUp(self):
+        super().setUp()
+        self.movies = CatalogFactory.movies(3)
+        self.user = CatalogFactory.user()
+        self.client.force_authenticate(self.user)
+
+    def review(self, movie_id):
+        return {"movie": movie_id, "description": "Great"}
+
+    def test_create_maintains_stats(self):
+        Review.objects.create(user=self.user, movie=self.movies[2], description="Ok")
+        response = self.client.post(
+            self.batch_url,
+            [self.review(self.movies[0].id), self.review(self.movies[1].id)],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        for movie in self.movies[:2]:
+            movie.refresh_from_db()
+            review = Review.objects.get(movie=movie, user=self.user)
+            self.assertEqual(movie.review_count, 1)
+            self.assertEqual(movie.last_reviewed_at, review.updated_at)
+
+    def test_invalid_items_are_reported(self):
+        Review.objects.create(user=self.user, movie=self.movies[1], description="Ok")
+        response = self.client.post(
+            self.batch_url,
+            [
+                self.review(self.movies[0].id),
+                self.review(self.movies[0].id),
+                self.review(self.movies[1].id),
+                self.review(0),
+                {"movie": self.movies[2].id},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        results = response.data["results"]
+        self.assertEqual(results[0]["status"], 201)
+        self.assertEqual(results[1]["errors"], {"movie": ["movie already reviewed."]})
+        self.assertEqual(results[2]["errors"], {"movie": ["movie already reviewed."]})
+        self.assertEqual(results[3]["errors"], {"movie": ["movie not found."]})
+        self.assertIn("description", results[4]["errors"])
+        self.assertEqual(Review.objects.filter(user=self.user).count(), 2)
+
+    def test_queries_do_not_grow_with_batch(self):
+        def count(movies):
+            user = CatalogFactory.user()
+            self.client.force_authenticate(user)
+            items = [self.review(movie.id) for movie in movies]
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(self.batch_url, items, format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            return len(context)
+
+        self.assertEqual(count(self.movies[:1]), count(self.movies))
+
+    def test_evicts_cached_responses(self):
+        movie = self.movies[0]
+        genre = movie.genre.get()
+        urls = [
+            reverse("list-movies"),
+            reverse("retrieve-movie", kwargs={"pk": movie.id}),
+            reverse("retrieve-genre", kwargs={"pk": genre.id}),
+        ]
+        before = [self.client.get(url).content for url in urls]
+        self.client.post(self.batch_url, [self.review(movie.id)], format="json")
+        for url, content in zip(urls, before):
+            self.assertNotEqual(self.client.get(url).content, content, url)
@@ -0,0 +1,49 @@
+from django.test import TestCase
+from MovieAPI.benchmark import Scenario, compare, percentile, route_names, run, seed
+from ..models import Movie, Review
+
+
+class BenchmarkTests(TestCase):
+    def setUp(self):
+        self.catalog = seed(users=5, genres=3, movies=20, reviews=30)
+
+    def test_seed(self):
+        self.assertEqual(
+            self.catalog.volumes(),
+            {"users": 5, "genres": 3, "movies": 20, "reviews": 30},
+        )
+        # review stats are rebuilt after the bulk insert
+        movie = Movie.objects.order_by("-review_count").first()
+        self.assertEqual(movie.review_count, Review.objects.filter(movie=movie).count())
+
+    def test_every_route_has_a_request(self):
+        scenario = Scenario(self.catalog)
+        for name in route_names():
+            self.assertTrue(hasattr(scenario, name.replace("-", "_")), name)
+
+    def test_every_route_succeeds(self):
+        results = run(self.catalog, iterations=1, warmup=0)
+        self.assertEqual(list(results), route_names())
+        failed = {name: stats for name, stats in results.items() if stats["errors"]}
+        self.assertEqual(failed, {})
+        self.assertEqual(results["list-genres"]["queries"], 1)
+        self.assertGreater(results["list-movies"]["bytes"], 0)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([3.0], 95), 3.0)
+
+    def test_compare(self):
+        stats = {"p50_ms": 10.0, "p95_ms": 20.0, "p99_ms": 30.0, "queries": 2}
+        baseline = {"endpoints": {"profile": dict(stats, bytes=100)}}
+        results = {
+            "profile": dict(stats, p50_ms=13.0, queries=3, bytes=100),
+            "login": dict(stats, bytes=10),
+        }
+        changes, regressions = compare(results, baseline, threshold=20)
+        self.assertEqual(list(changes), ["profile"])
+        self.assertEqual(changes["profile"]["p50_ms"], 30.0)
+        self.assertEqual(changes["profile"]["queries"], 1)
+        self.assertEqual(regressions, ["profile p50_ms +30.0%", "profile queries +1"])
@@ -0,0 +1,116 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from ..cache import stats
+from ..models import Genre, Review
+from .utils import CatalogFactory, MovieAPITestCase
+
+
+class ResponseCacheTests(MovieAPITestCase):
+    list_movies_url = reverse("list-movies")
+    list_genres_url = reverse("list-genres")
+
+    def setUp(self):
+        super().setUp()
+        self.drama = Genre.objects.create(name="Drama")
+        self.crime = Genre.objects.create(name="Crime")
+        self.heat, self.alien = CatalogFactory.movies(2, genres=[self.drama])
+        self.user = CatalogFactory.user()
+
+    def movie_url(self, movie):
+        return reverse("retrieve-movie", kwargs={"pk": movie.id})
+
+    def genre_url(self, genre):
+        return reverse("retrieve-genre", kwargs={"pk": genre.id})
+
+    def warm(self, *urls):
+        for url in urls:
+            self.client.get(url)
+
+    def assertCached(self, url):
+        hits = stats["hits"]
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(stats["hits"], hits + 1)
+
+    def assertNotCached(self, url):
+        hits = stats["hits"]
+        self.client.get(url)
+        self.assertEqual(stats["hits"], hits)
+
+    def test_hit_serves_without_queries(self):
+        self.warm(self.list_genres_url, self.genre_url(self.drama))
+        for url in (self.list_genres_url, self.genre_url(self.drama)):
+            with self.assertNumQueries(0):
+                self.assertCached(url)
+        # movie endpoints only run their ETag/Last-Modified aggregates
+        self.warm(self.list_movies_url, self.movie_url(self.heat))
+        with self.assertNumQueries(2):
+            self.assertCached(self.list_movies_url)
+        with self.assertNumQueries(1):
+            self.assertCached(self.movie_url(self.heat))
+
+    def test_query_string_is_part_of_key(self):
+        self.warm(self.list_movies_url)
+        self.assertNotCached(self.list_movies_url + "?page_size=1")
+
+    @override_settings(ALLOWED_HOSTS=["testserver", "api.example.com"])
+    def test_scheme_and_host_are_part_of_key(self):
+        self.warm(self.list_movies_url + "?page_size=1")
+        for extra in ({"secure": True}, {"HTTP_HOST": "api.example.com"}):
+            hits = stats["hits"]
+            response = self.client.get(self.list_movies_url + "?page_size=1", **extra)
+            self.assertEqual(stats["hits"], hits)
+            self.assertEqual(
+                response.data["next"].split("/movie/")[0],
+                "https://testserver"
+                if extra.get("secure")
+                else "http://api.example.com",
+            )
+
+    def test_new_review_evicts_only_affected_pages(self):
+        self.warm(
+            self.list_movies_url,
+            self.movie_url(self.heat),
+            self.movie_url(self.alien),
+            self.genre_url(self.drama),
+            self.genre_url(self.crime),
+            self.list_genres_url,
+        )
+        Review.objects.create(user=self.user, movie=self.heat, description="Great")
+        self.assertNotCached(self.list_movies_url)
+        self.assertNotCached(self.movie_url(self.heat))
+        self.assertNotCached(self.genre_url(self.drama))
+        self.assertCached(self.movie_url(self.alien))
+        self.assertCached(self.genre_url(self.crime))
+        self.assertCached(self.list_genres_url)
+        response = self.client.get(self.movie_url(self.heat))
+        self.assertEqual(len(response.data["movie_reviews"]), 1)
+
+    def test_genre_change_evicts_movies(self):
+        self.warm(self.movie_url(self.heat), self.genre_url(self.crime))
+        self.heat.genre.add(self.crime)
+        self.assertNotCached(self.movie_url(self.heat))
+        self.assertNotCached(self.genre_url(self.crime))
+        self.warm(self.movie_url(self.alien), self.list_genres_url)
+        self.drama.name = "Thriller"
+        self.drama.save()
+        self.assertNotCached(self.list_genres_url)
+        response = self.client.get(self.movie_url(self.alien))
+        self.assertEqual(response.data["genre"][0]["name"], "Thriller")
+
+    def test_deleted_movie_is_evicted(self):
+        self.warm(self.movie_url(self.heat), self.genre_url(self.drama))
+        self.heat.delete()
+        self.assertNotCached(self.genre_url(self.drama))
+        self.assertEqual(len(self.client.get(self.genre_url(self.drama)).data), 1)
+
+    def test_cache_stats_requires_admin(self):
+        url = reverse("cache-stats")
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        self.user.is_admin = True
+        self.user.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data), {"hits", "misses", "hit_ratio"})
@@ -0,0 +1,66 @@
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+from ..models import Review
+from .utils import CatalogFactory, MovieAPITestCase
+
+
+class ConditionalGetTests(MovieAPITestCase):
+    list_movies_url = reverse("list-movies")
+
+    def setUp(self):
+        super().setUp()
+        self.heat, self.alien = CatalogFactory.movies(2)
+        self.movie_url = reverse("retrieve-movie", kwargs={"pk": self.heat.id})
+
+    def assertNotModified(self, url, **headers):
+        # only the validator aggregates run, not the view
+        with self.assertNumQueries(2 if url == self.list_movies_url else 1):
+            response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_validators_are_sent(self):
+        for url in (self.list_movies_url, self.movie_url):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response["ETag"].startswith('"'))
+            self.assertIn("Last-Modified", response)
+
+    def test_if_none_match(self):
+        for url in (self.list_movies_url, self.movie_url):
+            etag = self.client.get(url)["ETag"]
+            self.assertNotModified(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(self.movie_url)["Last-Modified"]
+        self.assertNotModified(self.movie_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+    def test_review_changes_movie_version(self):
+        movie_etag = self.client.get(self.movie_url)["ETag"]
+        other_url = reverse("retrieve-movie", kwargs={"pk": self.alien.id})
+        other_etag = self.client.get(other_url)["ETag"]
+        list_etag = self.client.get(self.list_movies_url)["ETag"]
+        Review.objects.create(
+            user=CatalogFactory.user(), movie=self.heat, description="Great"
+        )
+        response = self.client.get(self.movie_url, HTTP_IF_NONE_MATCH=movie_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["movie_reviews"]), 1)
+        response = self.client.get(self.list_movies_url, HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotModified(other_url, HTTP_IF_NONE_MATCH=other_etag)
+
+    def test_page_has_own_etag(self):
+        first = self.client.get(self.list_movies_url)["ETag"]
+        second = self.client.get(self.list_movies_url + "?page_size=1")["ETag"]
+        self.assertNotEqual(first, second)
+
+    def test_deleted_movie_changes_list_version(self):
+        list_etag = self.client.get(self.list_movies_url)["ETag"]
+        self.alien.delete()
+        response = self.client.get(self.list_movies_url, HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_old_if_modified_since(self):
+        response = self.client.get(self.movie_url, HTTP_IF_MODIFIED_SINCE=http_date(0))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,30 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from MovieAPI.database import tune_sqlite_connection
+
+
+class SQLitePragmaTests(TestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA %s" % name)
+            return cursor.fetchone()[0]
+
+    def set_pragma(self, name, value):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA %s = %s" % (name, value))
+
+    def test_pragmas_applied_on_connect(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("sqlite only")
+        self.assertEqual(self.pragma("busy_timeout"), 5000)
+        # 1 is NORMAL
+        self.assertEqual(self.pragma("synchronous"), 1)
+
+    @override_settings(SQLITE_PRAGMAS={"busy_timeout": 1234})
+    def test_pragmas_from_settings(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("sqlite only")
+        busy_timeout = self.pragma("busy_timeout")
+        self.addCleanup(self.set_pragma, "busy_timeout", busy_timeout)
+        tune_sqlite_connection(sender=None, connection=connection)
+        self.assertEqual(self.pragma("busy_timeout"), 1234)
@@ -0,0 +1,38 @@
+import json
+from unittest import mock
+from django.urls import reverse
+from rest_framework import status
+from ..views import ExportMoviesView
+from .utils import CatalogFactory, MovieAPITestCase
+
+
+class ExportMoviesTests(MovieAPITestCase):
+    export_url = reverse("export-movies")
+
+    def setUp(self):
+        super().setUp()
+        self.movies = CatalogFactory.movies(7, reviews=2)
+        self.client.force_authenticate(CatalogFactory.user())
+
+    def test_streams_one_movie_per_line(self):
+        response = self.client.get(self.export_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        movies = [json.loads(line) for line in lines]
+        self.assertEqual([movie["id"] for movie in movies], [m.id for m in self.movies])
+        self.assertEqual(len(movies[0]["movie_reviews"]), 2)
+        self.assertEqual(len(movies[0]["genre"]), 1)
+
+    def test_queries_per_chunk(self):
+        # 1 query for the movies plus 2 prefetches for each chunk of 3 movies
+        with mock.patch.object(ExportMoviesView, "chunk_size", 3):
+            response = self.client.get(self.export_url)
+            with self.assertNumQueries(1 + 2 * 3):
+                b"".join(response.streaming_content)
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+        response = self.client.get(self.export_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,100 @@
+import re
+from datetime import date
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+from ..models import Genre, Movie
+from ..views import ListMoviesView
+from .utils import CatalogFactory, MovieAPITestCase
+
+
+class MovieFilterTests(MovieAPITestCase):
+    list_movies_url = reverse("list-movies")
+    filters = {
+        "genre": "drama",
+        "release_date_after": "1990-01-01",
+        "release_date_before": "1999-12-31",
+        "rating_min": "5",
+        "rating_max": "8",
+    }
+    orderings = ["", "release_date", "-rating", "review_count"]
+
+    def setUp(self):
+        super().setUp()
+        self.drama = Genre.objects.create(name="Drama")
+        self.crime = Genre.objects.create(name="Crime")
+        movies = CatalogFactory.movies(4, genres=[self.drama])
+        movies += CatalogFactory.movies(2, genres=[self.crime])
+        for movie, (release_date, rating) in zip(
+            movies,
+            [
+                (date(1995, 1, 1), 6),
+                (date(1998, 1, 1), 9),
+                (date(1985, 1, 1), 7),
+                (date(1992, 1, 1), 2),
+                (date(1996, 1, 1), 7),
+                (date(2005, 1, 1), 5),
+            ],
+        ):
+            Movie.objects.filter(id=movie.id).update(
+                release_date=release_date, rating=rating
+            )
+        self.movies = movies
+
+    def result_ids(self, **params):
+        response = self.client.get(self.list_movies_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [movie["id"] for movie in response.data["results"]]
+
+    def test_filters(self):
+        drama = {movie.id for movie in self.movies[:4]}
+        self.assertEqual(set(self.result_ids(genre="drama")), drama)
+        self.assertEqual(set(self.result_ids(genre=self.drama.id)), drama)
+        self.assertEqual(self.result_ids(genre="western"), [])
+        # not an id, looked up as a name
+        self.assertEqual(self.result_ids(genre="²"), [])
+        self.assertEqual(self.result_ids(**self.filters), [self.movies[0].id])
+        self.assertEqual(
+            self.result_ids(rating_min=7, ordering="rating"),
+            [self.movies[2].id, self.movies[4].id, self.movies[1].id],
+        )
+
+    def test_invalid_filter(self):
+        for params in ({"rating_min": 11}, {"genre": "9" * 30}):
+            response = self.client.get(self.list_movies_url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ordering_pages(self):
+        for ordering in self.orderings[1:]:
+            seen = []
+            url = self.list_movies_url + "?page_size=2&ordering=" + ordering
+            while url:
+                response = self.client.get(url)
+                seen.extend(movie["id"] for movie in response.data["results"])
+                url = response.data["next"]
+            self.assertEqual(len(seen), 6)
+            self.assertEqual(len(set(seen)), 6)
+
+    def test_no_full_table_scans(self):
+        # every combination of filters and ordering must be served by an index
+        names = list(self.filters)
+        for mask in range(1 << len(names)):
+            params = {
+                name: self.filters[name]
+                for bit, name in enumerate(names)
+                if mask & (1 << bit)
+            }
+            for ordering in self.orderings:
+                if ordering:
+                    params["ordering"] = ordering
+                request = APIRequestFactory().get(self.list_movies_url, params)
+                view = ListMoviesView()
+                view.setup(view.initialize_request(request))
+                view.format_kwarg = None
+                queryset = view.filter_queryset(view.get_queryset())
+                ordering = view.paginator.get_ordering(view.request, queryset, view)
+                plan = queryset.order_by(*ordering).explain()
+                # "SCAN <table>" without "USING ... INDEX" reads every row, a
+                # temp b-tree sorts every match before the first page
+                scans = re.findall(r"SCAN \w+$|USE TEMP B-TREE", plan, re.MULTILINE)
+                self.assertEqual(scans, [], "%s\n%s" % (params, plan))
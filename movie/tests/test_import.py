@@ -0,0 +1,137 @@
+import json
+import tempfile
+from io import StringIO
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from ..models import Genre, Movie
+from .utils import CatalogFactory, MovieAPITestCase
+
+
+class ImportMoviesTests(MovieAPITestCase):
+    import_url = reverse("import-movies")
+    rows = [
+        {"name": "Heat", "release_date": "1995-12-15", "rating": 8, "genre": ["Crime"]},
+        {
+            "name": "Alien",
+            "release_date": "1979-05-25",
+            "genre": [{"name": "horror"}, {"name": "Sci-Fi"}],
+        },
+        {"name": "", "release_date": "2000-01-01"},
+        {"name": "Bad date", "release_date": "01/01/2000"},
+    ]
+
+    def setUp(self):
+        super().setUp()
+        Genre.objects.create(name="Horror")
+
+    def jsonl(self):
+        return "\n".join(json.dumps(row) for row in self.rows) + "\n"
+
+    def assertImported(self):
+        self.assertEqual(Movie.objects.count(), 2)
+        alien = Movie.objects.get(name="Alien")
+        # existing genre is matched case-insensitively
+        self.assertEqual(
+            sorted(alien.genre.values_list("name", flat=True)), ["Horror", "Sci-Fi"]
+        )
+        self.assertEqual(Genre.objects.count(), 3)
+
+    def test_command_jsonl(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl") as file:
+            file.write(self.jsonl())
+            file.flush()
+            out, err = StringIO(), StringIO()
+            call_command(
+                "import_movies", file.name, batch_size=1, stdout=out, stderr=err
+            )
+        self.assertImported()
+        self.assertIn("Imported 2 movies, skipped 2 rows", out.getvalue())
+        self.assertIn("line 4", err.getvalue())
+
+    def test_command_csv(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as file:
+            file.write(
+                "name,release_date,rating,genre\n"
+                "Heat,1995-12-15,8,Crime\n"
+                "Alien,1979-05-25,,horror|Sci-Fi\n"
+            )
+            file.flush()
+            call_command("import_movies", file.name, stdout=StringIO())
+        self.assertImported()
+
+    def test_endpoint(self):
+        user = CatalogFactory.user()
+        self.client.force_authenticate(user)
+        upload = SimpleUploadedFile("catalog.jsonl", self.jsonl().encode())
+        response = self.client.post(self.import_url, {"file": upload})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["imported"], 2)
+        self.assertEqual(response.data["skipped"], 2)
+        self.assertImported()
+
+    def test_endpoint_requires_authentication(self):
+        upload = SimpleUploadedFile("catalog.jsonl", self.jsonl().encode())
+        response = self.client.post(self.import_url, {"file": upload})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_endpoint_skips_rows_that_are_not_utf8(self):
+        self.client.force_authenticate(CatalogFactory.user())
+        content = (
+            b'{"name": "Caf\xe9", "release_date": "2000-01-01"}\n'
+            + self.jsonl().encode()
+        )
+        upload = SimpleUploadedFile("catalog.jsonl", content)
+        response = self.client.post(self.import_url, {"file": upload})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["skipped"], 3)
+        self.assertEqual(
+            response.data["errors"][0], {"line": 1, "error": "row is not valid UTF-8"}
+        )
+        self.assertImported()
+
+    def test_endpoint_skips_rows_with_names_that_are_not_strings(self):
+        self.client.force_authenticate(CatalogFactory.user())
+        bad_rows = [
+            {"name": 5, "release_date": "2020-01-01"},
+            {"name": "Five", "release_date": "2020-01-01", "genre": [{"name": 5}]},
+        ]
+        content = "".join(json.dumps(row) + "\n" for row in bad_rows) + self.jsonl()
+        upload = SimpleUploadedFile("catalog.jsonl", content.encode())
+        response = self.client.post(self.import_url, {"file": upload})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["skipped"], 4)
+        self.assertEqual(
+            response.data["errors"][:2],
+            [
+                {"line": 1, "error": "name must be a string"},
+                {"line": 2, "error": "genre names must be strings"},
+            ],
+        )
+        self.assertImported()
+
+    def test_endpoint_rejects_file_without_valid_rows(self):
+        self.client.force_authenticate(CatalogFactory.user())
+        upload = SimpleUploadedFile("catalog.csv", "name\n".encode("utf-16"))
+        response = self.client.post(self.import_url, {"file": upload})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["imported"], 0)
+        self.assertEqual(Movie.objects.count(), 0)
+
+    def test_import_evicts_cached_responses(self):
+        horror = Genre.objects.get(name="Horror")
+        genre_url = reverse("retrieve-genre", kwargs={"pk": horror.id})
+        for url in (reverse("list-movies"), reverse("list-genres"), genre_url):
+            self.client.get(url)
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl") as file:
+            file.write(self.jsonl())
+            file.flush()
+            call_command(
+                "import_movies", file.name, stdout=StringIO(), stderr=StringIO()
+            )
+        self.assertEqual(
+            len(self.client.get(reverse("list-movies")).data["results"]), 2
+        )
+        self.assertEqual(len(self.client.get(reverse("list-genres")).data), 3)
+        self.assertEqual(len(self.client.get(genre_url).data), 1)
@@ -0,0 +1,99 @@
+import json
+import os
+import tempfile
+import threading
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from MovieAPI import metrics
+from .utils import CatalogFactory, MovieAPITestCase
+
+
+class MetricsTests(MovieAPITestCase):
+    metrics_url = reverse("metrics")
+
+    def setUp(self):
+        super().setUp()
+        metrics.clear()
+        CatalogFactory.movies(2)
+
+    def scrape(self, **headers):
+        response = self.client.get(self.metrics_url, **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        return response.content.decode()
+
+    def test_requests_by_view(self):
+        self.client.get(reverse("list-movies"))
+        self.client.get(reverse("list-movies"))
+        self.client.get(reverse("retrieve-movie", kwargs={"pk": 0}))
+        self.client.get("/no-such-page/")
+        text = self.scrape()
+        for line in (
+            "# TYPE movieapi_http_request_duration_seconds histogram",
+            'movieapi_http_requests_total{view="list-movies",method="GET",'
+            'status="2xx"} 2',
+            'movieapi_http_requests_total{view="retrieve-movie",method="GET",'
+            'status="4xx"} 1',
+            'movieapi_http_requests_total{view="unmatched",method="GET",'
+            'status="4xx"} 1',
+            'movieapi_http_request_duration_seconds_bucket{view="list-movies",'
+            'method="GET",le="+Inf"} 2',
+            'movieapi_http_request_duration_seconds_count{view="list-movies",'
+            'method="GET"} 2',
+            'movieapi_http_response_size_bytes_count{view="list-movies"} 2',
+        ):
+            self.assertIn(line, text.splitlines())
+        totals = metrics.snapshot()
+        self.assertGreater(totals[(metrics.QUERIES, "", (("view", "list-movies"),))], 0)
+
+    async def test_async_requests(self):
+        response = await self.async_client.get(reverse("async-list-movies"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        totals = metrics.snapshot()
+        labels = (("view", "async-list-movies"), ("method", "GET"))
+        self.assertEqual(
+            totals[(metrics.REQUESTS, "", labels + (("status", "2xx"),))], 1
+        )
+        self.assertGreater(totals[(metrics.QUERIES, "", labels[:1])], 0)
+
+    def test_threads_are_summed(self):
+        thread = threading.Thread(
+            target=metrics.observe, args=("login", "POST", 200, 0.2, 10, 2, 0.01)
+        )
+        thread.start()
+        thread.join()
+        metrics.observe("login", "POST", 401, 0.02, 10, 1, 0.01)
+        text = self.scrape()
+        self.assertIn(
+            'movieapi_http_request_duration_seconds_count{view="login",method="POST"} 2',
+            text,
+        )
+        self.assertIn(
+            'movieapi_http_request_duration_seconds_bucket{view="login",'
+            'method="POST",le="0.025"} 1',
+            text,
+        )
+        self.assertIn('movieapi_db_queries_total{view="login"} 3', text)
+
+    def test_processes_are_merged(self):
+        with tempfile.TemporaryDirectory() as directory:
+            labels = [["view", "login"], ["method", "POST"], ["status", "2xx"]]
+            # a worker that has exited
+            with open(os.path.join(directory, "1.json"), "w") as file:
+                json.dump([[metrics.REQUESTS, "", labels, 5]], file)
+            with override_settings(METRICS_DIR=directory):
+                metrics.observe("login", "POST", 200, 0.2, 10, 2, 0.01)
+                text = self.scrape()
+                own = os.path.join(directory, "%d.json" % os.getpid())
+                self.assertTrue(os.path.exists(own))
+        self.assertIn(
+            'movieapi_http_requests_total{view="login",method="POST",status="2xx"} 6',
+            text,
+        )
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_token(self):
+        response = self.client.get(self.metrics_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.scrape(HTTP_AUTHORIZATION="Bearer secret")
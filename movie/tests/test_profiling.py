@@ -0,0 +1,79 @@
+import io
+import marshal
+import zipfile
+from asgiref.sync import sync_to_async
+from django.core.exceptions import MiddlewareNotUsed
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from MovieAPI.profiling import ProfilingMiddleware
+from .utils import CatalogFactory, MovieAPITestCase
+
+
+class ProfilingTests(MovieAPITestCase):
+    list_movies_url = reverse("list-movies")
+
+    def setUp(self):
+        super().setUp()
+        CatalogFactory.movies(3, reviews=1)
+        self.staff = CatalogFactory.user()
+        self.staff.is_admin = True
+        self.staff.save()
+
+    def authenticate(self, user):
+        access = user.tokens()["access"]
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + access)
+
+    def test_report(self):
+        self.authenticate(self.staff)
+        response = self.client.get(
+            self.list_movies_url, {"__profile": "cprofile", "page_size": 2}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Profiled-Status"], "200")
+        report = response.content.decode()
+        self.assertTrue(report.startswith("GET /movie/?"))
+        self.assertIn("view list-movies", report)
+        self.assertIn("function calls", report)
+        self.assertIn("cumulative", report)
+        self.assertIn('FROM "movie_movie"', report)
+
+    async def test_async_view(self):
+        access = await sync_to_async(lambda: self.staff.tokens()["access"])()
+        response = await self.async_client.get(
+            reverse("async-list-movies"),
+            {"__profile": "cprofile"},
+            AUTHORIZATION="Bearer " + access,
+        )
+        self.assertEqual(response["X-Profiled-Status"], "200")
+        report = response.content.decode()
+        self.assertIn("view async-list-movies", report)
+        self.assertIn('FROM "movie_movie"', report)
+
+    def test_header_and_prof_file(self):
+        self.authenticate(self.staff)
+        response = self.client.get(reverse("profile"), HTTP_X_PROFILE="prof")
+        self.assertEqual(response["Content-Type"], "application/zip")
+        self.assertIn("profile-profile.zip", response["Content-Disposition"])
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            self.assertEqual(archive.namelist(), ["profile.prof", "queries.txt"])
+            stats = marshal.loads(archive.read("profile.prof"))
+            queries = archive.read("queries.txt").decode()
+        self.assertTrue(stats)
+        self.assertIn("queries in", queries)
+
+    def test_only_staff(self):
+        for user in (None, CatalogFactory.user()):
+            if user:
+                self.authenticate(user)
+            response = self.client.get(self.list_movies_url, {"__profile": "cprofile"})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn("results", response.data)
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer invalid")
+        response = self.client.get(self.list_movies_url, {"__profile": "cprofile"})
+        self.assertNotIn("X-Profiled-Status", response)
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            ProfilingMiddleware(lambda request: None)
@@ -0,0 +1,58 @@
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from rest_framework import status
+from ..models import Movie, Review
+from .utils import CatalogFactory, MovieAPITestCase
+
+
+class ReviewStatsTests(MovieAPITestCase):
+    def setUp(self):
+        super().setUp()
+        (self.movie,) = CatalogFactory.movies(1)
+        self.user = CatalogFactory.user()
+        self.client.force_authenticate(self.user)
+
+    def create_review(self):
+        url = reverse("create-review", kwargs={"pk": self.movie.id})
+        response = self.client.post(url, {"description": "Great"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Review.objects.get(movie=self.movie, user=self.user)
+
+    def test_review_views_maintain_stats(self):
+        review = self.create_review()
+        self.movie.refresh_from_db()
+        self.assertEqual(self.movie.review_count, 1)
+        self.assertEqual(self.movie.last_reviewed_at, review.updated_at)
+
+        url = reverse("update-review", kwargs={"pk": review.id})
+        self.client.put(url, {"description": "Still great"})
+        review.refresh_from_db()
+        self.movie.refresh_from_db()
+        self.assertEqual(self.movie.last_reviewed_at, review.updated_at)
+
+        url = reverse("delete-review", kwargs={"pk": review.id})
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.movie.refresh_from_db()
+        self.assertEqual(self.movie.review_count, 0)
+        self.assertIsNone(self.movie.last_reviewed_at)
+
+    def test_stats_are_read_only(self):
+        url = reverse("update-movie", kwargs={"pk": self.movie.id})
+        self.client.patch(url, {"review_count": 100}, format="json")
+        self.movie.refresh_from_db()
+        self.assertEqual(self.movie.review_count, 0)
+
+    def test_rebuild_detects_and_fixes_drift(self):
+        self.create_review()
+        call_command("rebuild_review_stats", "--check", stdout=StringIO())
+        Movie.objects.update(review_count=7)
+        with self.assertRaises(CommandError):
+            call_command("rebuild_review_stats", "--check", stdout=StringIO())
+        out = StringIO()
+        call_command("rebuild_review_stats", batch_size=1, stdout=out)
+        self.assertIn("fixed 1", out.getvalue())
+        self.movie.refresh_from_db()
+        self.assertEqual(self.movie.review_count, 1)
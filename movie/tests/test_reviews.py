@@ -0,0 +1,52 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from ..models import Review
+from .utils import CatalogFactory, MovieAPITestCase
+
+
+@override_settings(MOVIE_REVIEW_PREVIEW_SIZE=3)
+class MovieReviewsTests(MovieAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.movie, self.other = CatalogFactory.movies(2)
+        user = CatalogFactory.user()
+        self.reviews = [
+            Review.objects.create(user=user, movie=self.movie, description=str(i))
+            for i in range(7)
+        ]
+        Review.objects.create(user=user, movie=self.other, description="other")
+        self.reviews_url = reverse("movie-reviews", kwargs={"pk": self.movie.id})
+
+    def test_detail_embeds_latest_reviews(self):
+        url = reverse("retrieve-movie", kwargs={"pk": self.movie.id})
+        response = self.client.get(url)
+        self.assertEqual(
+            [review["id"] for review in response.data["movie_reviews"]],
+            [review.id for review in reversed(self.reviews[-3:])],
+        )
+        self.assertEqual(response.data["review_count"], 0)
+
+    def test_paginated_reviews(self):
+        seen = []
+        url = self.reviews_url + "?page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            seen.extend(review["id"] for review in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(seen, [review.id for review in reversed(self.reviews)])
+
+    def test_new_review_is_listed(self):
+        self.client.get(self.reviews_url)
+        review = Review.objects.create(
+            user=CatalogFactory.user(), movie=self.movie, description="new"
+        )
+        response = self.client.get(self.reviews_url)
+        self.assertEqual(response.data["results"][0]["id"], review.id)
+
+    def test_unknown_movie(self):
+        url = reverse("movie-reviews", kwargs={"pk": 0})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,75 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from drf_yasg.generators import OpenAPISchemaGenerator
+from rest_framework import status
+from rest_framework.test import APITestCase
+from MovieAPI.schema import clear_schema_cache, code_version
+
+
+class SchemaTests(APITestCase):
+    schema_url = reverse("schema-json") + "?format=openapi"
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.schema_file = os.path.join(self.directory.name, "api-schema.json")
+        self.settings = override_settings(API_SCHEMA_FILE=self.schema_file)
+        self.settings.enable()
+        clear_schema_cache()
+
+    def tearDown(self):
+        self.settings.disable()
+        self.directory.cleanup()
+        clear_schema_cache()
+
+    def generations(self):
+        return mock.patch.object(
+            OpenAPISchemaGenerator,
+            "get_schema",
+            autospec=True,
+            side_effect=OpenAPISchemaGenerator.get_schema,
+        )
+
+    def test_schema_generated_once(self):
+        with self.generations() as get_schema:
+            first = self.client.get(self.schema_url)
+            second = self.client.get(self.schema_url)
+        self.assertEqual(get_schema.call_count, 1)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.content, second.content)
+        schema = json.loads(first.content)
+        self.assertIn("/movie/", schema["paths"])
+        self.assertEqual(schema["x-code-version"], code_version())
+
+    def test_etag(self):
+        etag = self.client.get(self.schema_url)["ETag"]
+        self.assertEqual(etag, '"%s"' % code_version())
+        response = self.client.get(self.schema_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_ui_pages(self):
+        for name in ("schema-swagger-ui", "schema-redoc"):
+            response = self.client.get(reverse(name), HTTP_ACCEPT="text/html")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            response = self.client.get(reverse(name) + "?format=openapi")
+            self.assertEqual(response["ETag"], '"%s"' % code_version())
+
+    def test_served_from_generated_file(self):
+        call_command("generate_schema", stdout=StringIO())
+        clear_schema_cache()
+        with self.generations() as get_schema:
+            response = self.client.get(self.schema_url)
+        get_schema.assert_not_called()
+        with open(self.schema_file, "rb") as file:
+            self.assertEqual(response.content, file.read())
+
+    def test_stale_file_is_ignored(self):
+        with open(self.schema_file, "w") as file:
+            json.dump({"x-code-version": "old", "paths": {}}, file)
+        response = self.client.get(self.schema_url)
+        self.assertIn("/movie/", json.loads(response.content)["paths"])
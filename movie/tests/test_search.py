@@ -0,0 +1,69 @@
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from ..models import Movie, Review
+from .utils import CatalogFactory, MovieAPITestCase
+
+
+class SearchMoviesTests(MovieAPITestCase):
+    search_url = reverse("search-movies")
+
+    def setUp(self):
+        super().setUp()
+        self.heat, self.alien, self.up = CatalogFactory.movies(3)
+        Movie.objects.filter(id=self.heat.id).update(name="Heat")
+        Movie.objects.filter(id=self.alien.id).update(name="Alien")
+        Movie.objects.filter(id=self.up.id).update(name="Up")
+        self.user = CatalogFactory.user()
+
+    def search(self, q, **params):
+        response = self.client.get(self.search_url, {"q": q, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def result_ids(self, q, **params):
+        return [movie["id"] for movie in self.search(q, **params).data["results"]]
+
+    def test_name_and_prefix_match(self):
+        self.assertEqual(self.result_ids("heat"), [self.heat.id])
+        self.assertEqual(self.result_ids("ali"), [self.alien.id])
+
+    def test_review_text_is_indexed(self):
+        review = Review.objects.create(
+            user=self.user, movie=self.up, description="A balloon adventure"
+        )
+        self.assertEqual(self.result_ids("balloon"), [self.up.id])
+        review.description = "A house adventure"
+        review.save()
+        self.assertEqual(self.result_ids("balloon"), [])
+        review.delete()
+        self.assertEqual(self.result_ids("adventure"), [])
+
+    def test_name_match_ranks_above_review_match(self):
+        Review.objects.create(
+            user=self.user, movie=self.up, description="Feels like Heat, but worse"
+        )
+        self.assertEqual(self.result_ids("heat"), [self.heat.id, self.up.id])
+
+    def test_deleted_movie_is_removed(self):
+        self.heat.delete()
+        self.assertEqual(self.result_ids("heat"), [])
+
+    def test_pagination(self):
+        for movie in (self.heat, self.alien, self.up):
+            Review.objects.create(user=self.user, movie=movie, description="classic")
+        first = self.search("classic", page_size=2)
+        self.assertEqual(len(first.data["results"]), 2)
+        self.assertIsNone(first.data["previous"])
+        second = self.client.get(first.data["next"])
+        self.assertEqual(len(second.data["results"]), 1)
+        self.assertIsNone(second.data["next"])
+
+    def test_q_is_required(self):
+        response = self.client.get(self.search_url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rebuild_index(self):
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual(self.result_ids("up"), [self.up.id])
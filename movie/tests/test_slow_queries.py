@@ -0,0 +1,90 @@
+import os
+from asgiref.sync import sync_to_async
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from MovieAPI import slow_queries
+from .utils import CatalogFactory, MovieAPITestCase
+
+
+@override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_EXPLAIN_RATE=1)
+class SlowQueryLogTests(MovieAPITestCase):
+    url = reverse("slow-queries")
+
+    def setUp(self):
+        super().setUp()
+        slow_queries.entries.clear()
+        self.movie = CatalogFactory.movies(1)[0]
+        self.admin = CatalogFactory.user()
+        self.admin.is_admin = True
+        self.admin.save()
+
+    def logged(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.force_authenticate(None)
+        return [
+            entry
+            for entry in response.data["queries"]
+            if entry["view"] != "slow-queries"
+        ]
+
+    def test_query_is_logged_with_view_and_call_site(self):
+        self.client.get(reverse("retrieve-movie", kwargs={"pk": self.movie.id}))
+        entries = self.logged()
+        self.assertTrue(entries)
+        self.assertEqual({entry["view"] for entry in entries}, {"retrieve-movie"})
+        # newest first
+        self.assertGreaterEqual(entries[0]["at"], entries[-1]["at"])
+        movie_query = next(
+            entry for entry in entries if '"movie_movie"' in entry["sql"]
+        )
+        self.assertIn(str(self.movie.id), movie_query["params"])
+        self.assertTrue(movie_query["call_site"].startswith("movie" + os.sep))
+        self.assertTrue(movie_query["explain"])
+        self.assertNotIn("failed", movie_query["explain"])
+
+    async def test_async_view(self):
+        url = reverse("async-retrieve-movie", kwargs={"pk": self.movie.id})
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        entries = await sync_to_async(self.logged)()
+        self.assertTrue(entries)
+        self.assertEqual({entry["view"] for entry in entries}, {"async-retrieve-movie"})
+
+    def test_writes_are_not_explained(self):
+        user = CatalogFactory.user()
+        self.client.force_authenticate(user)
+        self.client.post(
+            reverse("create-review", kwargs={"pk": self.movie.id}),
+            {"description": "Great"},
+        )
+        writes = [
+            entry
+            for entry in self.logged()
+            if entry["sql"].startswith(("INSERT", "UPDATE"))
+        ]
+        self.assertTrue(writes)
+        self.assertEqual({entry["explain"] for entry in writes}, {None})
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=10_000)
+    def test_fast_queries_are_not_logged(self):
+        self.client.get(reverse("list-movies"))
+        self.assertEqual(self.logged(), [])
+
+    def test_ring_buffer_is_bounded(self):
+        for _ in range(slow_queries.entries.maxlen + 10):
+            # not cached
+            self.client.get(reverse("search-movies"), {"q": self.movie.name})
+        self.assertEqual(len(slow_queries.entries), slow_queries.entries.maxlen)
+
+    def test_admin_only_and_clear(self):
+        self.client.force_authenticate(CatalogFactory.user())
+        self.assertEqual(
+            self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN
+        )
+        self.client.force_authenticate(self.admin)
+        response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(len(slow_queries.entries), 0)
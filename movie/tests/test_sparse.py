@@ -0,0 +1,71 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from ..models import Genre
+from .utils import CatalogFactory, MovieAPITestCase
+
+
+class SparseFieldsTests(MovieAPITestCase):
+    list_movies_url = reverse("list-movies")
+
+    def setUp(self):
+        super().setUp()
+        self.drama = Genre.objects.create(name="Drama")
+        self.movies = CatalogFactory.movies(3, genres=[self.drama], reviews=2)
+        self.movie_url = reverse("retrieve-movie", kwargs={"pk": self.movies[0].id})
+        self.genre_url = reverse("retrieve-genre", kwargs={"pk": self.drama.id})
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # ETag/Last-Modified aggregates don't load rows
+        self.queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if not query["sql"].startswith("SELECT MAX(")
+        ]
+        return response.data
+
+    def test_default_shape_is_unchanged(self):
+        movie = self.get(self.movie_url)
+        self.assertIn("genre", movie)
+        self.assertIn("movie_reviews", movie)
+
+    def test_fields_only(self):
+        movies = self.get(self.list_movies_url, fields="id,name")["results"]
+        self.assertEqual(set(movies[0]), {"id", "name"})
+        # one table, only the requested and the cursor columns
+        self.assertEqual(len(self.queries), 1)
+        self.assertNotIn('"movie_movie"."updated_at"', self.queries[0])
+
+    def test_expand(self):
+        movie = self.get(self.movie_url, fields="id", expand="reviews")
+        self.assertEqual(set(movie), {"id", "movie_reviews"})
+        self.assertEqual(len(movie["movie_reviews"]), 2)
+        self.assertEqual(len(self.queries), 2)
+
+        movie = self.get(self.movie_url, expand="genre")
+        self.assertIn("genre", movie)
+        self.assertIn("release_date", movie)
+        self.assertNotIn("movie_reviews", movie)
+
+    def test_genre_movies(self):
+        movies = self.get(self.genre_url, fields="id,name")
+        self.assertEqual(len(movies), 3)
+        self.assertEqual(set(movies[0]), {"id", "name"})
+
+    def test_cursor_pages_with_sparse_fields(self):
+        url = self.list_movies_url + "?fields=name&page_size=1&ordering=rating"
+        seen = 0
+        while url:
+            response = self.client.get(url)
+            seen += len(response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(seen, 3)
+
+    def test_unknown_field(self):
+        for params in ({"fields": "id,password"}, {"expand": "users"}):
+            response = self.client.get(self.list_movies_url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
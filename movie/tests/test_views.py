@@ -0,0 +1,171 @@
+import base64
+from urllib.parse import urlencode
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from ..genres import resolve_genre_ids
+from ..models import Genre, Movie
+from .utils import CatalogFactory, MovieAPITestCase, QueryBudgetMixin
+
+
+class MovieReadQueryBudgetTests(QueryBudgetMixin, MovieAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.genres = [Genre.objects.create(name=name) for name in ("Drama", "Crime")]
+        self.movies = CatalogFactory.movies(10, genres=self.genres, reviews=3)
+
+    def test_list_genres(self):
+        response = self.assertWithinQueryBudget("list-genres", reverse("list-genres"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_movies(self):
+        response = self.assertWithinQueryBudget("list-movies", reverse("list-movies"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertEqual(len(response.data["results"][0]["genre"]), 2)
+        self.assertEqual(len(response.data["results"][0]["movie_reviews"]), 3)
+
+    def test_list_movies_budget_does_not_grow_with_catalog(self):
+        CatalogFactory.movies(20, genres=self.genres, reviews=2)
+        response = self.assertWithinQueryBudget("list-movies", reverse("list-movies"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_movie(self):
+        url = reverse("retrieve-movie", kwargs={"pk": self.movies[0].id})
+        response = self.assertWithinQueryBudget("retrieve-movie", url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["movie_reviews"]), 3)
+
+    def test_retrieve_genre(self):
+        url = reverse("retrieve-genre", kwargs={"pk": self.genres[0].id})
+        response = self.assertWithinQueryBudget("retrieve-genre", url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 10)
+
+
+class MovieCursorPaginationTests(MovieAPITestCase):
+    list_movies_url = reverse("list-movies")
+
+    def setUp(self):
+        super().setUp()
+        self.movies = CatalogFactory.movies(25)
+
+    def test_walk_all_pages(self):
+        seen = []
+        url = self.list_movies_url + "?page_size=10"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 10)
+            seen.extend(movie["id"] for movie in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(sorted(seen), sorted(movie.id for movie in self.movies))
+
+    def test_ordered_by_release_date_then_id(self):
+        response = self.client.get(self.list_movies_url)
+        keys = [
+            (movie["release_date"], movie["id"]) for movie in response.data["results"]
+        ]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+    def walk(self, url):
+        """
+        ids of every page from url on, each page must be one query without
+        OFFSET
+        """
+        seen = []
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            page = [q["sql"] for q in context.captured_queries if "LIMIT" in q["sql"]]
+            self.assertEqual(len(page), 1)
+            self.assertNotIn("OFFSET", page[0])
+            seen.extend(movie["id"] for movie in response.data["results"])
+            url = response.data["next"]
+        return seen
+
+    def test_ties_are_paged_by_id_without_offset(self):
+        Movie.objects.update(rating=5)
+        ids = sorted(movie.id for movie in self.movies)
+        url = self.list_movies_url + "?ordering=%s&page_size=10"
+        self.assertEqual(self.walk(url % "rating"), ids)
+        self.assertEqual(self.walk(url % "-rating"), ids[::-1])
+
+    def test_previous_pages(self):
+        url = self.list_movies_url + "?ordering=-review_count&page_size=10"
+        pages = []
+        while url:
+            response = self.client.get(url)
+            pages.append(response.data["results"])
+            url = response.data["next"]
+        for page in reversed(pages[:-1]):
+            response = self.client.get(response.data["previous"])
+            self.assertEqual(response.data["results"], page)
+        self.assertIsNone(response.data["previous"])
+
+    def test_invalid_cursor(self):
+        for position in ("x", "[1]", '["x","1"]'):
+            cursor = base64.b64encode(urlencode({"p": position}).encode()).decode()
+            response = self.client.get(self.list_movies_url + "?cursor=" + cursor)
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_size_is_capped(self):
+        CatalogFactory.movies(80)
+        response = self.client.get(self.list_movies_url + "?page_size=1000")
+        self.assertEqual(len(response.data["results"]), 100)
+
+
+class MovieGenreResolutionTests(MovieAPITestCase):
+    create_movie_url = reverse("create-movie")
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(CatalogFactory.user())
+        self.drama = Genre.objects.create(name="Drama")
+
+    def create_movie(self, genres):
+        data = {
+            "name": "Heat",
+            "release_date": "1995-12-15",
+            "genre": [{"name": genre} for genre in genres],
+        }
+        return self.client.post(self.create_movie_url, data, format="json")
+
+    def test_create_resolves_genres_case_insensitively(self):
+        response = self.create_movie(["drama", "Crime"])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        movie = Movie.objects.get(id=response.data["id"])
+        self.assertEqual(
+            sorted(movie.genre.values_list("name", flat=True)), ["Crime", "Drama"]
+        )
+        self.assertEqual(Genre.objects.count(), 2)
+
+    def test_create_query_count_does_not_grow_with_genres(self):
+        with CaptureQueriesContext(connection) as few:
+            self.create_movie(["Drama", "Crime"])
+        with CaptureQueriesContext(connection) as many:
+            self.create_movie(["Drama", "Crime", "Action", "Horror", "Comedy", "War"])
+        self.assertEqual(len(few), len(many))
+
+    def test_update_toggles_genres(self):
+        movie_id = self.create_movie(["Drama", "Crime"]).data["id"]
+        url = reverse("update-movie", kwargs={"pk": movie_id})
+        data = {"genre": [{"name": "crime"}, {"name": "Thriller"}]}
+        response = self.client.patch(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        movie = Movie.objects.get(id=movie_id)
+        self.assertEqual(
+            sorted(movie.genre.values_list("name", flat=True)), ["Drama", "Thriller"]
+        )
+
+    @override_settings(MOVIE_GENRE_CACHE=True)
+    def test_genre_cache_is_invalidated(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(resolve_genre_ids(["drama"]), {"drama": self.drama.id})
+        with self.assertNumQueries(0):
+            self.assertEqual(resolve_genre_ids(["DRAMA"]), {"drama": self.drama.id})
+        self.drama.delete()
+        drama = Genre.objects.create(name="Drama")
+        self.assertEqual(resolve_genre_ids(["drama"]), {"drama": drama.id})
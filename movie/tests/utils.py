@@ -0,0 +1,71 @@
+from datetime import date
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from faker import Faker
+from rest_framework.test import APITestCase
+from user.models import User
+from ..cache import get_cache
+from ..models import Genre, Movie, Review
+
+
+class MovieAPITestCase(APITestCase):
+    def setUp(self):
+        # cached responses would outlive the rolled back test data
+        get_cache().clear()
+
+
+class QueryBudgetMixin:
+    # maximum number of queries each read endpoint may issue, independent of
+    # how many movies, genres or reviews are in the database. movie endpoints
+    # include the ETag/Last-Modified aggregates, see movie.conditional
+    query_budgets = {
+        "list-genres": 1,
+        "retrieve-genre": 4,
+        "list-movies": 5,
+        "retrieve-movie": 4,
+    }
+
+    def assertWithinQueryBudget(self, url_name, url, **kwargs):
+        budget = self.query_budgets[url_name]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, **kwargs)
+        queries = [query["sql"] for query in context.captured_queries]
+        self.assertLessEqual(
+            len(queries),
+            budget,
+            "%s issued %d queries, budget is %d:\n%s"
+            % (url_name, len(queries), budget, "\n".join(queries)),
+        )
+        return response
+
+
+class CatalogFactory:
+    fake = Faker()
+
+    @classmethod
+    def user(cls):
+        email = cls.fake.unique.email()
+        return User.objects.create_user(
+            email=email, username=email.split("@")[0], password=cls.fake.password()
+        )
+
+    @classmethod
+    def movies(cls, count, genres=None, reviews=0):
+        genres = genres or [Genre.objects.create(name=cls.fake.unique.word())]
+        users = [cls.user() for _ in range(reviews)]
+        movies = []
+        for _ in range(count):
+            movie = Movie.objects.create(
+                name=cls.fake.sentence(nb_words=3)[:50],
+                release_date=cls.fake.date_between(
+                    date(1950, 1, 1), date(2022, 12, 31)
+                ),
+                rating=cls.fake.random_int(0, 10),
+            )
+            movie.genre.add(*genres)
+            for user in users:
+                Review.objects.create(
+                    user=user, movie=movie, description=cls.fake.sentence()
+                )
+            movies.append(movie)
+        return movies
@@ -1,4 +1,10 @@
 from django.urls import path
+from .async_views import (
+    AsyncListGenresView,
+    AsyncRetrieveGenreView,
+    AsyncListMoviesView,
+    AsyncRetrieveMovieView,
+)
 from .views import (
     ListGenresView,
     RetrieveGenreView,
@@ -7,12 +13,19 @@ from .views import (
     DeleteGenreView,
     ListMoviesView,
     RetrieveMovieView,
+    MovieReviewsView,
+    SearchMoviesView,
+    ExportMoviesView,
     CreateMovieView,
+    ImportMoviesView,
+    BatchCreateMoviesView,
     UpdateMovieView,
     DeleteMovieView,
     CreateReviewView,
+    BatchCreateReviewsView,
     UpdateReviewView,
     DeleteReviewView,
+    CacheStatsView,
 )
 
 
@@ -23,11 +36,31 @@ urlpatterns = [
     path("update-genre/<int:pk>/", UpdateGenreView.as_view(), name="update-genre"),
     path("delete-genre/<int:pk>/", DeleteGenreView.as_view(), name="delete-genre"),
     path("", ListMoviesView.as_view(), name="list-movies"),
+    path("export/", ExportMoviesView.as_view(), name="export-movies"),
+    path("search/", SearchMoviesView.as_view(), name="search-movies"),
     path("<int:pk>/", RetrieveMovieView.as_view(), name="retrieve-movie"),
+    path("<int:pk>/reviews/", MovieReviewsView.as_view(), name="movie-reviews"),
     path("create-movie/", CreateMovieView.as_view(), name="create-movie"),
+    path("import-movies/", ImportMoviesView.as_view(), name="import-movies"),
+    path("batch/", BatchCreateMoviesView.as_view(), name="batch-create-movies"),
     path("update-movie/<int:pk>/", UpdateMovieView.as_view(), name="update-movie"),
     path("delete-movie/<int:pk>/", DeleteMovieView.as_view(), name="delete-movie"),
     path("create-review/<int:pk>/", CreateReviewView.as_view(), name="create-review"),
+    path(
+        "reviews/batch/", BatchCreateReviewsView.as_view(), name="batch-create-reviews"
+    ),
     path("update-review/<int:pk>/", UpdateReviewView.as_view(), name="update-review"),
     path("delete-review/<int:pk>/", DeleteReviewView.as_view(), name="delete-review"),
+    path("cache-stats/", CacheStatsView.as_view(), name="cache-stats"),
+    # native async variants of the read endpoints, for ASGI servers
+    path("async/", AsyncListMoviesView.as_view(), name="async-list-movies"),
+    path(
+        "async/<int:pk>/", AsyncRetrieveMovieView.as_view(), name="async-retrieve-movie"
+    ),
+    path("async/genres/", AsyncListGenresView.as_view(), name="async-list-genres"),
+    path(
+        "async/genre/<int:pk>/",
+        AsyncRetrieveGenreView.as_view(),
+        name="async-retrieve-genre",
+    ),
 ]
@@ -1,28 +1,53 @@
+import json
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
 from rest_framework.response import Response
-from rest_framework import generics, status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework import filters, generics, status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+from .batch import batch_error, create_movies, create_reviews
+from .cache import CachedResponseMixin, cache_stats
+from .conditional import conditional_get, movie_list_version, movie_version
+from .genres import resolve_genre_ids
+from .importers import import_movies, open_text, read_rows
 from .models import Genre, Movie, Review
+from .pagination import MovieCursorPagination, ReviewCursorPagination
+from .review_stats import review_added, review_deleted, review_updated
+from .search import get_search_backend
+from .sparse import SparseMovieMixin
 from .serializers import (
     GenreSerializer,
     MovieSerializer,
+    MovieFilterSerializer,
+    ReviewSerializer,
     CreateUpdateMovieSerializer,
     CreateUpdateReviewSerializer,
 )
 
 
-class ListGenresView(generics.ListAPIView):
+class ListGenresView(CachedResponseMixin, generics.ListAPIView):
+    cache_tags = ("genres",)
     serializer_class = GenreSerializer
     queryset = Genre.objects.all()
 
 
-class RetrieveGenreView(generics.GenericAPIView):
+class RetrieveGenreView(
+    SparseMovieMixin, CachedResponseMixin, generics.RetrieveAPIView
+):
+    cache_tags = ("genre:{pk}",)
     serializer_class = MovieSerializer
     queryset = Genre.objects.all()
 
-    def get(self, request, pk):
+    def retrieve(self, request, pk):
         queryset = self.queryset.get(id=pk)
-        movies = queryset.movies.all()
-        serializer = self.serializer_class(movies, many=True)
+        movies = self.shape_queryset(queryset.movies.all())
+        serializer = self.get_serializer(movies, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -72,21 +97,220 @@ class DeleteGenreView(generics.DestroyAPIView):
         return Response({"genre": "deleted"}, status=status.HTTP_200_OK)
 
 
-class ListMoviesView(generics.ListAPIView):
+@conditional_get(movie_list_version)
+class ListMoviesView(SparseMovieMixin, CachedResponseMixin, generics.ListAPIView):
+    cache_tags = ("movies",)
     serializer_class = MovieSerializer
+    pagination_class = MovieCursorPagination
+    filter_backends = [filters.OrderingFilter]
+    # each ordering has a matching (field, id) index on Movie
+    ordering_fields = ["release_date", "rating", "review_count"]
+    ordering = MovieCursorPagination.ordering
+    # cursor positions are read from the ordering fields of each movie
+    required_fields = ordering_fields
     queryset = Movie.objects.all()
+    # query parameter, field, lookup
+    range_filters = [
+        ("release_date_after", "release_date", "__gte"),
+        ("release_date_before", "release_date", "__lte"),
+        ("rating_min", "rating", "__gte"),
+        ("rating_max", "rating", "__lte"),
+    ]
+
+    def get_queryset(self):
+        params = MovieFilterSerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        params = params.validated_data
+        queryset = super().get_queryset()
+        # pages walk the (field, id) index of the ordering, see
+        # movie.pagination. Ranges on other fields are checked per row, their
+        # index would have every match sorted before the first page
+        ordered_by = self.paginator.get_ordering(self.request, queryset, self)
+        ordered_by = ordered_by[0].lstrip("-")
+        for param, field, lookup in self.range_filters:
+            if param in params:
+                if field != ordered_by:
+                    # same value, but not a column the planner has an index for
+                    queryset = queryset.alias(
+                        **{field + "_value": Coalesce(field, field)}
+                    )
+                    field += "_value"
+                queryset = queryset.filter(**{field + lookup: params[param]})
+        if "genre" in params:
+            genre = self.get_genre_id(params["genre"])
+            if genre is None:
+                return queryset.none()
+            # walks the index of the ordering and probes the unique
+            # (movie, genre) index, a join would sort every movie of the genre
+            queryset = queryset.filter(
+                Exists(
+                    Movie.genre.through.objects.filter(
+                        movie_id=OuterRef("pk"), genre_id=genre
+                    )
+                )
+            )
+        # nested genre and movie_reviews are loaded in one query each
+        return self.shape_queryset(queryset)
+
+    def get_genre_id(self, genre):
+        if isinstance(genre, int):
+            return genre
+        # names are resolved first so the movie query filters on genre_id
+        return resolve_genre_ids([genre], create=False).get(genre.lower())
 
 
-class RetrieveMovieView(generics.RetrieveAPIView):
+@conditional_get(movie_version)
+class RetrieveMovieView(
+    SparseMovieMixin, CachedResponseMixin, generics.RetrieveAPIView
+):
+    cache_tags = ("movie:{pk}",)
     serializer_class = MovieSerializer
     queryset = Movie.objects.all()
 
+    def get_queryset(self):
+        if getattr(self, "swagger_fake_view", False):
+            return Movie.objects.none()
+        return self.shape_queryset(super().get_queryset())
+
+    def get_prefetch(self, relation):
+        if relation != "movie_reviews":
+            return relation
+        # only the latest reviews are embedded, see MovieReviewsView for the rest
+        latest = Review.objects.filter(movie_id=self.kwargs["pk"]).order_by(
+            "-created_at", "-id"
+        )
+        latest = latest.values("id")[: settings.MOVIE_REVIEW_PREVIEW_SIZE]
+        return Prefetch(
+            "movie_reviews",
+            queryset=Review.objects.filter(id__in=Subquery(latest)).order_by(
+                "-created_at", "-id"
+            ),
+        )
+
+
+class MovieReviewsView(CachedResponseMixin, generics.ListAPIView):
+    cache_tags = ("movie:{pk}",)
+    serializer_class = ReviewSerializer
+    pagination_class = ReviewCursorPagination
+
+    def get_queryset(self):
+        if getattr(self, "swagger_fake_view", False):
+            return Review.objects.none()
+        return Review.objects.filter(movie_id=self.kwargs["pk"])
+
+    def list(self, request, pk):
+        if not Movie.objects.filter(id=pk).exists():
+            return Response(
+                {"error": "movie not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+        return super().list(request)
+
+
+class ExportMoviesView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = MovieSerializer
+    queryset = Movie.objects.order_by("id").prefetch_related("genre", "movie_reviews")
+    # movies held in memory at once, genres and reviews are prefetched per chunk
+    chunk_size = 500
+
+    def get(self, request):
+        return StreamingHttpResponse(self.stream(), content_type="application/x-ndjson")
+
+    def stream(self):
+        for movie in self.get_queryset().iterator(chunk_size=self.chunk_size):
+            line = json.dumps(
+                self.serializer_class(movie).data,
+                cls=JSONEncoder,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+            yield line + "\n"
+
+
+class SearchMoviesView(SparseMovieMixin, generics.GenericAPIView):
+    serializer_class = MovieSerializer
+    queryset = Movie.objects.all()
+    page_size = 20
+    max_page_size = 100
+
+    def get(self, request):
+        q = request.query_params.get("q", "").strip()
+        if not q:
+            return Response(
+                {"error": "q is required."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            page = max(int(request.query_params.get("page", 1)), 1)
+            page_size = int(request.query_params.get("page_size", self.page_size))
+        except ValueError:
+            return Response(
+                {"error": "page and page_size must be integers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        page_size = min(max(page_size, 1), self.max_page_size)
+        # one extra id tells whether there is a next page
+        ids = get_search_backend().search(q, (page - 1) * page_size, page_size + 1)
+        movies = self.shape_queryset(self.get_queryset()).in_bulk(ids[:page_size])
+        serializer = self.get_serializer(
+            [movies[movie_id] for movie_id in ids[:page_size] if movie_id in movies],
+            many=True,
+        )
+        url = request.build_absolute_uri()
+        return Response(
+            {
+                "next": replace_query_param(url, "page", page + 1)
+                if len(ids) > page_size
+                else None,
+                "previous": replace_query_param(url, "page", page - 1)
+                if page > 1
+                else None,
+                "results": serializer.data,
+            },
+            status=status.HTTP_200_OK,
+        )
+
 
 class CreateMovieView(generics.CreateAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = CreateUpdateMovieSerializer
 
 
+class ImportMoviesView(APIView):
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+    formats = {"jsonl": "jsonl", "json": "jsonl", "csv": "csv"}
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"error": "file is required."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        extension = upload.name.rsplit(".", 1)[-1].lower()
+        format = self.formats.get(request.data.get("format") or extension)
+        if format is None:
+            return Response(
+                {"error": "file must be jsonl or csv."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        # uploaded file is read line by line, not loaded into memory
+        result = import_movies(read_rows(open_text(upload.file), format))
+        if not result.imported:
+            return Response(result.as_dict(), status=status.HTTP_400_BAD_REQUEST)
+        return Response(result.as_dict(), status=status.HTTP_201_CREATED)
+
+
+class BatchCreateMoviesView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        error = batch_error(request.data)
+        if error:
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+        result = create_movies(request.data)
+        return Response(result.as_dict(), status=result.status_code)
+
+
 class UpdateMovieView(generics.UpdateAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = CreateUpdateMovieSerializer
@@ -104,19 +328,32 @@ class CreateReviewView(generics.CreateAPIView):
     queryset = Movie.objects.all()
 
     def create(self, request, pk):
-        user = request.user
+        # only the id, request.user may be built from token claims
+        user_id = request.user.id
         movie = self.queryset.get(id=pk)
-        review = Review.objects.filter(movie=movie, user=user)
+        review = Review.objects.filter(movie=movie, user_id=user_id)
         if review.exists():
             return Response(
                 {"error": "movie already reviewed."}, status=status.HTTP_400_BAD_REQUEST
             )
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save(user=user, movie=movie)
+        with transaction.atomic():
+            review_added(serializer.save(user_id=user_id, movie=movie))
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+class BatchCreateReviewsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        error = batch_error(request.data)
+        if error:
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+        result = create_reviews(request.user.id, request.data)
+        return Response(result.as_dict(), status=result.status_code)
+
+
 class UpdateReviewView(generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = CreateUpdateReviewSerializer
@@ -124,14 +361,15 @@ class UpdateReviewView(generics.GenericAPIView):
 
     def put(self, request, pk):
         instance = self.queryset.get(id=pk)
-        if instance.user != request.user:
+        if instance.user_id != request.user.id:
             return Response(
                 {"error": "only review creator can update review."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
         serializer = self.serializer_class(instance, data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        with transaction.atomic():
+            review_updated(serializer.save())
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -141,9 +379,21 @@ class DeleteReviewView(generics.DestroyAPIView):
 
     def destroy(self, request, pk, *args, **kwargs):
         review = self.queryset.get(id=pk)
-        if review.user != request.user:
+        if review.user_id != request.user.id:
             return Response(
                 {"error": "only review creator can delete review."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
         return super().destroy(request, *args, **kwargs)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            review_deleted(instance)
+
+
+class CacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(cache_stats(), status=status.HTTP_200_OK)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import User
+from .models import OutboundEmail, User
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
 
@@ -20,3 +20,10 @@ class UserAdmin(BaseUserAdmin):
 
 
 admin.site.register(User, UserAdmin)
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ("id", "to_email", "subject", "status", "attempts", "created_at")
+    list_filter = ("status",)
+    readonly_fields = ("id", "created_at", "sent_at")
@@ -0,0 +1,89 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from .models import User
+
+
+class ClaimsUser(TokenUser):
+    """
+    Request user built from the claims User.tokens() signs into access tokens,
+    see User.TOKEN_CLAIMS. Has the id and flags permission checks need, views
+    that need the full row load it with get_request_user().
+    """
+
+    @property
+    def is_verified(self):
+        return self.token.get("is_verified", False)
+
+    @property
+    def is_admin(self):
+        return self.token.get("is_admin", False)
+
+    @property
+    def is_staff(self):
+        return self.is_admin
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Authenticates without a user query. Claims are as fresh as the access
+    token, so a deactivated or demoted user keeps access until it expires.
+    Tokens without the claims, e.g. from the refresh endpoint, fall back to
+    the user query.
+    """
+
+    def get_user(self, validated_token):
+        if all(claim in validated_token for claim in User.TOKEN_CLAIMS):
+            return ClaimsUser(validated_token)
+        return super().get_user(validated_token)
+
+
+# user id -> (expires, user), evicted by the user signals on save and delete,
+# least recently used first, at most USER_AUTH_CACHE_SIZE entries
+_user_cache = OrderedDict()
+_user_cache_lock = threading.Lock()
+
+
+def forget_user(user_id):
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+
+
+class CachedUserJWTAuthentication(JWTAuthentication):
+    """
+    Keeps up to USER_AUTH_CACHE_SIZE authenticated users in a per-process
+    cache for USER_AUTH_CACHE_TIMEOUT seconds. Saves in this process evict the
+    entry right away, other processes see them once it expires.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get("user_id")
+        now = time.monotonic()
+        with _user_cache_lock:
+            cached = _user_cache.get(user_id)
+            if cached is not None:
+                _user_cache.move_to_end(user_id)
+        if cached is None or cached[0] < now:
+            user = super().get_user(validated_token)
+            cached = (now + settings.USER_AUTH_CACHE_TIMEOUT, user)
+            with _user_cache_lock:
+                _user_cache[user_id] = cached
+                _user_cache.move_to_end(user_id)
+                while len(_user_cache) > settings.USER_AUTH_CACHE_SIZE:
+                    _user_cache.popitem(last=False)
+        # requests get their own copy, a view may change it
+        return copy.copy(cached[1])
+
+
+def get_request_user(request):
+    """
+    Returns the User row of the authenticated request, loading it only when
+    the request user was built from token claims.
+    """
+    if isinstance(request.user, User):
+        return request.user
+    return User.objects.get(pk=request.user.pk)
@@ -0,0 +1,42 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import OperationalError
+from user.outbox import send_queued_emails
+
+
+class Command(BaseCommand):
+    help = "Send queued emails in batches over reused SMTP connections."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--threads", type=int, default=4)
+        parser.add_argument("--max-attempts", type=int, default=5)
+        parser.add_argument(
+            "--loop", action="store_true", help="keep polling for new emails"
+        )
+        parser.add_argument(
+            "--interval", type=float, default=5, help="seconds between empty polls"
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                sent, failed = send_queued_emails(
+                    batch_size=options["batch_size"],
+                    threads=options["threads"],
+                    max_attempts=options["max_attempts"],
+                )
+            except OperationalError as e:
+                # e.g. "database is locked" while another worker writes,
+                # claimed emails are retried once their lease runs out
+                if not options["loop"]:
+                    raise
+                self.stderr.write("Sending failed: %s" % e)
+                time.sleep(options["interval"])
+                continue
+            if sent or failed:
+                self.stdout.write("Sent %d emails, %d failed." % (sent, failed))
+            if not options["loop"]:
+                break
+            if sent + failed < options["batch_size"]:
+                time.sleep(options["interval"])
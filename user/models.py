@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import (
     BaseUserManager,
     AbstractBaseUser,
@@ -62,6 +63,8 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
+    # signed into access tokens for ClaimsJWTAuthentication
+    TOKEN_CLAIMS = ("username", "is_verified", "is_admin")
 
     def __str__(self):
         return self.email
@@ -81,4 +84,37 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     def tokens(self):
         token = RefreshToken.for_user(self)
-        return {"refresh": str(token), "access": str(token.access_token)}
+        access = token.access_token
+        for claim in self.TOKEN_CLAIMS:
+            access[claim] = getattr(self, claim)
+        return {"refresh": str(token), "access": str(access)}
+
+
+#  Outgoing emails, sent by the send_queued_emails command
+class OutboundEmail(models.Model):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUS_CHOICES = [(PENDING, "Pending"), (SENT, "Sent"), (FAILED, "Failed")]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    to_email = models.EmailField(max_length=255)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    # set by the worker that claimed the email last, see user.outbox
+    claim_token = models.UUIDField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"], name="outbound_email_due_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return "%s: %s" % (self.to_email, self.subject)
@@ -0,0 +1,120 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import timedelta
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import OutboundEmail
+
+# a claimed email is retried by another worker if not finished within the lease
+CLAIM_LEASE = timedelta(minutes=5)
+RETRY_BASE_DELAY = timedelta(seconds=30)
+RETRY_MAX_DELAY = timedelta(hours=1)
+
+
+def retry_delay(attempts):
+    return min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+
+
+def due_ids(due, batch_size):
+    due = due.order_by("next_attempt_at")
+    if connection.features.has_select_for_update_skip_locked:
+        # rows another worker is claiming are skipped rather than waited for
+        due = due.select_for_update(skip_locked=True)
+    return list(due.values_list("id", flat=True)[:batch_size])
+
+
+def claim_batch(batch_size):
+    """
+    Returns up to batch_size due emails and pushes their next_attempt_at past
+    the lease, so concurrent workers don't pick them up again. The UPDATE
+    checks again that each row is due, so of two workers that selected the
+    same rows only one claims each, also on databases without row locks
+    such as SQLite. Only the rows carrying this worker's claim token are
+    returned.
+    """
+    now = timezone.now()
+    token = uuid.uuid4()
+    due = OutboundEmail.objects.filter(
+        status=OutboundEmail.PENDING, next_attempt_at__lte=now
+    )
+    # on SQLite a read transaction that starts writing fails at once when
+    # another one writes, rather than waiting, so it runs in autocommit
+    locking = connection.features.has_select_for_update_skip_locked
+    with transaction.atomic() if locking else nullcontext():
+        ids = due_ids(due, batch_size)
+        due.filter(id__in=ids).update(
+            next_attempt_at=now + CLAIM_LEASE, claim_token=token
+        )
+    return list(
+        OutboundEmail.objects.filter(id__in=ids, claim_token=token).order_by(
+            "next_attempt_at"
+        )
+    )
+
+
+def deliver(emails):
+    """
+    Sends emails over one reused SMTP connection, returns {id: error message}
+    for the ones that failed. Runs in worker threads, so it doesn't touch the
+    database.
+    """
+    errors = {}
+    try:
+        mail_connection = get_connection()
+        mail_connection.open()
+    except Exception as e:
+        return {email.id: str(e) for email in emails}
+    try:
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                to=[email.to_email],
+                connection=mail_connection,
+            )
+            try:
+                message.send(fail_silently=False)
+            except Exception as e:
+                errors[email.id] = str(e) or e.__class__.__name__
+    finally:
+        mail_connection.close()
+    return errors
+
+
+def send_queued_emails(batch_size=100, threads=4, max_attempts=5):
+    """
+    Sends one batch of due emails split across threads, one SMTP connection
+    per thread. Failed emails are retried with exponential backoff and marked
+    failed after max_attempts. Returns the number of sent and failed emails.
+    """
+    emails = claim_batch(batch_size)
+    if not emails:
+        return 0, 0
+    threads = max(1, min(threads, len(emails)))
+    chunks = [emails[i::threads] for i in range(threads)]
+    errors = {}
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for chunk_errors in executor.map(deliver, chunks):
+            errors.update(chunk_errors)
+
+    now = timezone.now()
+    sent = [email for email in emails if email.id not in errors]
+    failed = [email for email in emails if email.id in errors]
+    for email in sent:
+        email.status = OutboundEmail.SENT
+        email.attempts += 1
+        email.sent_at = now
+        email.last_error = ""
+    for email in failed:
+        email.attempts += 1
+        email.last_error = errors[email.id]
+        if email.attempts >= max_attempts:
+            email.status = OutboundEmail.FAILED
+        else:
+            email.next_attempt_at = now + retry_delay(email.attempts)
+    OutboundEmail.objects.bulk_update(
+        emails, ["status", "attempts", "sent_at", "last_error", "next_attempt_at"]
+    )
+    return len(sent), len(failed)
@@ -1,15 +1,19 @@
 from rest_framework import renderers
-import json
 
 
 class UserRenderer(renderers.JSONRenderer):
+    """
+    Wraps the payload in {"errors": ...} for failed responses and in
+    {"data": ...} otherwise, encoded in a single json pass.
+    """
+
     charset = "utf-8"
 
     def render(self, data, accepted_media_type=None, renderer_context=None):
-        response = ""
-        if "ErrorDetail" in str(data):
-            response = json.dumps({"errors": data})
+        response = (renderer_context or {}).get("response")
+        # exception is set by the view's exception handler
+        if response is not None and (response.exception or response.status_code >= 400):
+            envelope = {"errors": data}
         else:
-            response = json.dumps({"data": data})
-
-        return response
+            envelope = {"data": data}
+        return super().render(envelope, accepted_media_type, renderer_context)
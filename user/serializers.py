@@ -5,9 +5,10 @@ from django.core.exceptions import ValidationError
 from django.utils.http import urlsafe_base64_decode
 from django.utils.encoding import smart_str
 from rest_framework.exceptions import AuthenticationFailed
-from rest_framework_simplejwt.tokens import RefreshToken, TokenError
+from rest_framework_simplejwt.tokens import TokenError
 from rest_framework import serializers
 from .models import User
+from .tokens import CachedBlacklistRefreshToken
 from movie.serializers import ReviewSerializer
 
 
@@ -86,7 +87,7 @@ class UserLogoutSerializer(serializers.Serializer):
 
     def save(self, **kwargs):
         try:
-            RefreshToken(self.token).blacklist()
+            CachedBlacklistRefreshToken(self.token).blacklist()
         except TokenError:
             self.fail("bad_token")
 
@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from .authentication import forget_user
+from .models import User
+from .tokens import remember_blacklisted
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    forget_user(instance.pk)
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def remember_blacklisted_token(sender, instance, **kwargs):
+    token = instance.token
+    remember_blacklisted(token.jti, token.expires_at.timestamp())
+
+
+@receiver(post_delete, sender=BlacklistedToken)
+def forget_blacklisted_token(sender, instance, **kwargs):
+    token = instance.token
+    remember_blacklisted(token.jti, token.expires_at.timestamp(), False)
@@ -0,0 +1,89 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+from ..authentication import (
+    CachedUserJWTAuthentication,
+    ClaimsJWTAuthentication,
+    ClaimsUser,
+    _user_cache,
+    forget_user,
+    get_request_user,
+)
+from ..models import User
+
+
+class AuthenticationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", username="user", password="Secret@123"
+        )
+        self.user.is_admin = True
+        self.user.save()
+        self.access = self.user.tokens()["access"]
+
+    def tearDown(self):
+        forget_user(self.user.id)
+
+    def authenticate(self, authentication, access=None):
+        request = APIRequestFactory().get(
+            "/", HTTP_AUTHORIZATION="Bearer " + (access or self.access)
+        )
+        return authentication.authenticate(request)[0]
+
+    def test_claims_user_without_query(self):
+        with self.assertNumQueries(0):
+            user = self.authenticate(ClaimsJWTAuthentication())
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual(user, self.user)
+        self.assertEqual(user.username, "user")
+        self.assertTrue(user.is_staff)
+        self.assertFalse(user.is_verified)
+
+    def test_claims_fall_back_to_query(self):
+        # e.g. issued by the refresh endpoint
+        access = str(AccessToken.for_user(self.user))
+        with self.assertNumQueries(1):
+            user = self.authenticate(ClaimsJWTAuthentication(), access)
+        self.assertIsInstance(user, User)
+
+    def test_get_request_user_loads_row(self):
+        request = APIRequestFactory().get("/")
+        request.user = self.authenticate(ClaimsJWTAuthentication())
+        with self.assertNumQueries(1):
+            self.assertEqual(get_request_user(request).email, "user@example.com")
+        request.user = self.user
+        with self.assertNumQueries(0):
+            self.assertIs(get_request_user(request), self.user)
+
+    def test_cached_user(self):
+        authentication = CachedUserJWTAuthentication()
+        with self.assertNumQueries(1):
+            self.authenticate(authentication)
+        with self.assertNumQueries(0):
+            user = self.authenticate(authentication)
+        self.assertEqual(user.email, "user@example.com")
+        # saving evicts the user
+        self.user.username = "renamed"
+        self.user.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.authenticate(authentication).username, "renamed")
+
+    @override_settings(USER_AUTH_CACHE_SIZE=2)
+    def test_cached_users_are_bounded(self):
+        authentication = CachedUserJWTAuthentication()
+        users = [self.user] + [
+            User.objects.create_user(
+                email="user%d@example.com" % i, username="user%d" % i
+            )
+            for i in range(2)
+        ]
+        for user in users[1:]:
+            self.addCleanup(forget_user, user.id)
+        for user in users[:2]:
+            self.authenticate(authentication, user.tokens()["access"])
+        # the first user is now the most recently used
+        self.authenticate(authentication)
+        self.authenticate(authentication, users[2].tokens()["access"])
+        self.assertEqual(list(_user_cache), [self.user.id, users[2].id])
+        with self.assertNumQueries(0):
+            self.authenticate(authentication)
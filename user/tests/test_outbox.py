@@ -0,0 +1,77 @@
+from io import StringIO
+from unittest import mock
+from django.core import mail
+from django.core.management import call_command
+from django.db import OperationalError
+from django.test import TestCase
+from django.utils import timezone
+from ..models import OutboundEmail
+from ..outbox import claim_batch, send_queued_emails
+from ..utils import Util
+
+
+class OutboxTests(TestCase):
+    def queue(self, count):
+        for i in range(count):
+            Util.queue_email(
+                {
+                    "email_subject": "Verify your email",
+                    "email_body": "Hi %d" % i,
+                    "to_email": "user%d@example.com" % i,
+                }
+            )
+
+    def test_queue_does_not_send(self):
+        self.queue(1)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboundEmail.objects.get().status, OutboundEmail.PENDING)
+
+    def test_send_batch(self):
+        self.queue(5)
+        self.assertEqual(send_queued_emails(batch_size=3, threads=2), (3, 0))
+        self.assertEqual(send_queued_emails(batch_size=3, threads=2), (2, 0))
+        self.assertEqual(send_queued_emails(), (0, 0))
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(
+            OutboundEmail.objects.filter(status=OutboundEmail.SENT).count(), 5
+        )
+
+    def test_failed_email_is_retried_then_given_up(self):
+        self.queue(1)
+        with mock.patch(
+            "user.outbox.EmailMessage.send", side_effect=OSError("refused")
+        ):
+            self.assertEqual(send_queued_emails(), (0, 1))
+            email = OutboundEmail.objects.get()
+            self.assertEqual(email.status, OutboundEmail.PENDING)
+            self.assertEqual(email.last_error, "refused")
+            self.assertGreater(email.next_attempt_at, timezone.now())
+            # not due until the backoff has passed
+            self.assertEqual(send_queued_emails(), (0, 0))
+            OutboundEmail.objects.update(next_attempt_at=timezone.now())
+            self.assertEqual(send_queued_emails(max_attempts=2), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.FAILED)
+        self.assertEqual(email.attempts, 2)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_rows_claimed_by_another_worker_are_skipped(self):
+        self.queue(3)
+        first = claim_batch(2)
+        # a worker whose SELECT ran before the first one's UPDATE
+        all_ids = list(OutboundEmail.objects.values_list("id", flat=True))
+        with mock.patch("user.outbox.due_ids", return_value=all_ids):
+            second = claim_batch(3)
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertNotIn(second[0].id, [email.id for email in first])
+
+    def test_loop_survives_database_errors(self):
+        with mock.patch(
+            "user.management.commands.send_queued_emails.send_queued_emails",
+            side_effect=[OperationalError("database is locked"), KeyboardInterrupt],
+        ), mock.patch("time.sleep"):
+            err = StringIO()
+            with self.assertRaises(KeyboardInterrupt):
+                call_command("send_queued_emails", loop=True, stderr=err)
+        self.assertIn("database is locked", err.getvalue())
@@ -0,0 +1,39 @@
+import json
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.response import Response
+from django.test import SimpleTestCase
+from ..renderers import UserRenderer
+
+
+class UserRendererTests(SimpleTestCase):
+    def render(self, data, status, exception=False):
+        response = Response(data, status=status)
+        response.exception = exception
+        rendered = UserRenderer().render(data, renderer_context={"response": response})
+        self.assertIsInstance(rendered, bytes)
+        return json.loads(rendered)
+
+    def test_data_envelope(self):
+        self.assertEqual(self.render({"msg": "ok"}, 200), {"data": {"msg": "ok"}})
+
+    def test_errors_envelope(self):
+        data = {"email": [ErrorDetail("Enter a valid email address.", code="invalid")]}
+        self.assertEqual(
+            self.render(data, 400, exception=True),
+            {"errors": {"email": ["Enter a valid email address."]}},
+        )
+
+    def test_error_status_without_exception(self):
+        data = {"msg": "Error while sending verification email."}
+        self.assertEqual(self.render(data, 400), {"errors": data})
+
+    def test_user_content_does_not_flip_envelope(self):
+        data = {"username": "ErrorDetail"}
+        self.assertEqual(self.render(data, 200), {"data": data})
+
+    def test_compact_output(self):
+        response = Response({"a": 1})
+        rendered = UserRenderer().render(
+            {"a": 1}, renderer_context={"response": response}
+        )
+        self.assertEqual(rendered, b'{"data":{"a":1}}')
@@ -0,0 +1,80 @@
+import threading
+from unittest import mock
+from django.conf import settings
+from django.core.cache import caches
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from ..models import User
+from ..throttling import HashingEmailThrottle, HashingIPThrottle
+
+
+class HashingThrottleTests(APITestCase):
+    login_url = reverse("login")
+    profile_url = reverse("profile")
+
+    def setUp(self):
+        caches[settings.USER_THROTTLE_CACHE].clear()
+        self.user = User.objects.create_user(
+            email="user@example.com", username="user", password="Secret@123"
+        )
+        self.user.is_verified = True
+        self.user.save()
+
+    def tearDown(self):
+        caches[settings.USER_THROTTLE_CACHE].clear()
+
+    def login(self, email="user@example.com", password="Secret@123", **extra):
+        return self.client.post(
+            self.login_url, {"email": email, "password": password}, **extra
+        )
+
+    @mock.patch.object(HashingEmailThrottle, "rate", "2/min", create=True)
+    def test_email_bucket(self):
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.assertEqual(self.login(password="wrong").status_code, 401)
+        response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "30")
+        # another account isn't limited
+        self.assertEqual(self.login(email="other@example.com").status_code, 401)
+
+    @mock.patch.object(HashingIPThrottle, "rate", "2/min", create=True)
+    def test_ip_bucket(self):
+        self.login()
+        self.login(email="other@example.com")
+        response = self.login(email="third@example.com")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        response = self.login(REMOTE_ADDR="10.0.0.2")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_bucket_refills(self):
+        with mock.patch.object(HashingEmailThrottle, "rate", "1/min", create=True):
+            with mock.patch.object(HashingEmailThrottle, "timer", return_value=0):
+                self.login()
+                self.assertEqual(self.login().status_code, 429)
+            with mock.patch.object(HashingEmailThrottle, "timer", return_value=60):
+                self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+    def test_busy_hashing_slots(self):
+        slots = threading.BoundedSemaphore(1)
+        with mock.patch("user.throttling.hashing_slots", slots):
+            slots.acquire()
+            response = self.login()
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertEqual(response["Retry-After"], "1")
+            slots.release()
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+            # the slot was given back
+            self.assertTrue(slots.acquire(blocking=False))
+
+    def test_cheap_endpoints_not_limited(self):
+        self.client.force_authenticate(self.user)
+        with mock.patch("user.throttling.hashing_slots", threading.Semaphore(0)):
+            response = self.client.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_body_that_is_not_an_object(self):
+        for url in (self.login_url, reverse("register")):
+            response = self.client.post(url, [1, 2], format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
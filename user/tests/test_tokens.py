@@ -0,0 +1,94 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from ..models import User
+
+
+class TokenBlacklistTests(APITestCase):
+    refresh_url = reverse("token_refresh")
+    logout_url = reverse("logout")
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", username="user", password="Secret@123"
+        )
+        self.tokens = self.user.tokens()
+
+    def refresh(self):
+        return self.client.post(self.refresh_url, {"refresh": self.tokens["refresh"]})
+
+    def test_refresh_checks_blacklist_once(self):
+        self.assertEqual(self.refresh().status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.refresh().status_code, status.HTTP_200_OK)
+
+    def test_logout_blacklists_cached_token(self):
+        self.refresh()
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.tokens["access"])
+        response = self.client.post(
+            self.logout_url, {"refresh": self.tokens["refresh"]}
+        )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.refresh().status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unblacklisted_token_refreshes(self):
+        token = OutstandingToken.objects.get()
+        BlacklistedToken.objects.create(token=token)
+        self.assertEqual(self.refresh().status_code, status.HTTP_401_UNAUTHORIZED)
+        BlacklistedToken.objects.get().delete()
+        self.assertEqual(self.refresh().status_code, status.HTTP_200_OK)
+
+    def test_purge_expired_tokens(self):
+        for token in OutstandingToken.objects.all():
+            BlacklistedToken.objects.create(token=token)
+        self.user.tokens()
+        self.user.tokens()
+        OutstandingToken.objects.filter(
+            id__lte=OutstandingToken.objects.order_by("id")[1].id
+        ).update(expires_at=timezone.now() - timedelta(seconds=1))
+        out = StringIO()
+        call_command("purge_expired_tokens", batch_size=1, stdout=out)
+        self.assertIn("Purged 2 expired tokens.", out.getvalue())
+        self.assertEqual(OutstandingToken.objects.count(), 1)
+        self.assertEqual(BlacklistedToken.objects.count(), 0)
+
+    def test_purge_query_count_does_not_grow_with_batch(self):
+        def purge(count):
+            for _ in range(count):
+                self.user.tokens()
+            for token in OutstandingToken.objects.all():
+                BlacklistedToken.objects.get_or_create(token=token)
+            OutstandingToken.objects.update(
+                expires_at=timezone.now() - timedelta(seconds=1)
+            )
+            with CaptureQueriesContext(connection) as context:
+                call_command("purge_expired_tokens", stdout=StringIO())
+            self.assertFalse(OutstandingToken.objects.exists())
+            return len(context)
+
+        self.assertEqual(purge(2), purge(20))
+
+    def test_token_stats_requires_admin(self):
+        url = reverse("token-stats")
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        self.user.is_admin = True
+        self.user.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["outstanding"], 1)
+        self.assertEqual(response.data["expired"], 0)
+        self.assertEqual(response.data["blacklisted"], 0)
+        self.assertEqual(
+            set(response.data["blacklist_cache"]), {"hits", "misses", "hit_ratio"}
+        )
@@ -1,5 +1,7 @@
 from django.urls import reverse
+from io import StringIO
 from django.core import mail
+from django.core.management import call_command
 from rest_framework.test import APITestCase
 from rest_framework import status
 from faker import Faker
@@ -23,6 +25,8 @@ class UserRegistrationTests(APITestCase):
         }
         response = self.client.post(self.registration_url, data)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        # emails are queued, the worker sends them
+        call_command("send_queued_emails", stdout=StringIO())
         # check one verification email
         self.assertEqual(len(mail.outbox), 1)
         verification_link = mail.outbox[0].body.splitlines()[2]
@@ -124,6 +128,7 @@ class UserPasswordTests(APITestCase):
         data = {"email": self.email}
         reset_email_response = self.client.post(self.password_reset_email_url, data)
         self.assertEqual(reset_email_response.status_code, status.HTTP_200_OK)
+        call_command("send_queued_emails", stdout=StringIO())
         # check one password reset email
         self.assertEqual(len(mail.outbox), 1)
         reset_link = mail.outbox[0].body.splitlines()[2]
@@ -0,0 +1,99 @@
+import os
+import threading
+from collections.abc import Mapping
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Token bucket over a shared cache, a rate of "10/min" allows bursts of
+    10 requests refilled at 10 per minute. The read-modify-write isn't
+    atomic, concurrent requests may occasionally slip one extra request in.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.cache = caches[settings.USER_THROTTLE_CACHE]
+
+    def allow_request(self, request, view):
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        now = self.timer()
+        tokens, updated = self.cache.get(self.key, (self.num_requests, now))
+        refill = (now - updated) * self.num_requests / self.duration
+        self.tokens = min(self.num_requests, tokens + refill)
+        if self.tokens < 1:
+            return False
+        # an untouched bucket is full again after duration
+        self.cache.set(self.key, (self.tokens - 1, now), self.duration)
+        return True
+
+    def wait(self):
+        return (1 - self.tokens) * self.duration / self.num_requests
+
+
+class HashingIPThrottle(TokenBucketThrottle):
+    scope = "hashing_ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class HashingEmailThrottle(TokenBucketThrottle):
+    """
+    Limits password hashing per account, keyed by the posted email, the
+    authenticated user or the password reset uid.
+    """
+
+    scope = "hashing_email"
+
+    def get_cache_key(self, request, view):
+        if request.user.is_authenticated:
+            ident = "user:%s" % request.user.pk
+        elif "uidb64" in view.kwargs:
+            ident = "uid:%s" % view.kwargs["uidb64"]
+        elif not isinstance(request.data, Mapping):
+            # left to the serializer to reject
+            return None
+        else:
+            email = request.data.get("email")
+            if not isinstance(email, str) or not email:
+                return None
+            ident = "email:%s" % email.strip().lower()
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+# password hashing requests running at once in this process
+hashing_slots = threading.BoundedSemaphore(
+    settings.USER_HASHING_CONCURRENCY or os.cpu_count() or 1
+)
+
+
+class HashingThrottleMixin:
+    """
+    For views that hash passwords. Rate limits them per IP and per account
+    and rejects them with 429 when every hashing slot is busy, rather than
+    queueing more CPU bound work behind the cheap endpoints.
+    """
+
+    throttle_classes = [HashingIPThrottle, HashingEmailThrottle]
+    holds_hashing_slot = False
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if not hashing_slots.acquire(blocking=False):
+            raise Throttled(wait=settings.USER_HASHING_RETRY_AFTER)
+        self.holds_hashing_slot = True
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if self.holds_hashing_slot:
+            hashing_slots.release()
+            self.holds_hashing_slot = False
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,65 @@
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import serializers
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+stats = {"hits": 0, "misses": 0}
+
+
+def get_blacklist_cache():
+    return caches[settings.USER_TOKEN_BLACKLIST_CACHE]
+
+
+def _key(jti):
+    return "token-blacklist:%s" % jti
+
+
+def remember_blacklisted(jti, exp, blacklisted=True):
+    # blacklisted tokens are remembered until they expire anyway, tokens that
+    # aren't for a short time, a logout in another process may not see them
+    # with a per process cache
+    timeout = max(1, int(exp - time.time()))
+    if not blacklisted:
+        timeout = min(timeout, settings.USER_TOKEN_BLACKLIST_CACHE_TIMEOUT)
+    get_blacklist_cache().set(_key(jti), blacklisted, timeout)
+
+
+def is_blacklisted(jti, exp):
+    blacklisted = get_blacklist_cache().get(_key(jti))
+    if blacklisted is not None:
+        stats["hits"] += 1
+        return blacklisted
+    stats["misses"] += 1
+    blacklisted = BlacklistedToken.objects.filter(token__jti=jti).exists()
+    remember_blacklisted(jti, exp, blacklisted)
+    return blacklisted
+
+
+def blacklist_cache_stats():
+    total = stats["hits"] + stats["misses"]
+    return {
+        "hits": stats["hits"],
+        "misses": stats["misses"],
+        "hit_ratio": round(stats["hits"] / total, 4) if total else 0.0,
+    }
+
+
+class CachedBlacklistRefreshToken(RefreshToken):
+    """
+    Refresh token that checks the blacklist through the cache, so repeated
+    refreshes of the same token don't query the blacklist table. Blacklisting
+    updates the cache through the BlacklistedToken signals.
+    """
+
+    def check_blacklist(self):
+        if is_blacklisted(self.payload[api_settings.JTI_CLAIM], self.payload["exp"]):
+            raise TokenError(_("Token is blacklisted"))
+
+
+class TokenRefreshSerializer(serializers.TokenRefreshSerializer):
+    token_class = CachedBlacklistRefreshToken
@@ -9,6 +9,7 @@ from .views import (
     UserPasswordChangeView,
     RequestPasswordResetEmailView,
     UserPasswordResetView,
+    TokenStatsView,
 )
 
 
@@ -18,6 +19,7 @@ urlpatterns = [
     path("login/", UserLoginView.as_view(), name="login"),
     path("logout/", UserLogoutView.as_view(), name="logout"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("token-stats/", TokenStatsView.as_view(), name="token-stats"),
     path("profile/", UserProfileView.as_view(), name="profile"),
     path("password-change/", UserPasswordChangeView.as_view(), name="password-change"),
     path(
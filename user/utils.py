@@ -1,4 +1,5 @@
 from django.core.mail import EmailMessage
+from .models import OutboundEmail
 
 
 class Util:
@@ -10,3 +11,12 @@ class Util:
             to=[data["to_email"]],
         )
         email.send(fail_silently=False)
+
+    @staticmethod
+    def queue_email(data):
+        # delivered by the send_queued_emails command, see user.outbox
+        return OutboundEmail.objects.create(
+            subject=data["email_subject"],
+            body=data["email_body"],
+            to_email=data["to_email"],
+        )
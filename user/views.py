@@ -4,15 +4,24 @@ from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 from django.conf import settings
 from django.urls import reverse
-from rest_framework.permissions import IsAuthenticated
+from django.utils import timezone
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import generics
 from rest_framework import status
+from rest_framework.views import APIView
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
 import jwt
+from .authentication import get_request_user
 from .models import User
 from .renderers import UserRenderer
+from .throttling import HashingThrottleMixin
+from .tokens import blacklist_cache_stats
 from .utils import Util
 from .serializers import (
     UserRegistrationSerializer,
@@ -26,7 +35,7 @@ from .serializers import (
 )
 
 
-class UserRegistrationView(generics.GenericAPIView):
+class UserRegistrationView(HashingThrottleMixin, generics.GenericAPIView):
     serializer_class = UserRegistrationSerializer
     renderer_classes = [UserRenderer]
 
@@ -54,13 +63,8 @@ class UserRegistrationView(generics.GenericAPIView):
             "to_email": user.email,
         }
         print("Email verification link:", verificationLink)
-        try:
-            Util.send_email(data)
-        except:
-            return Response(
-                {"msg": "Error while sending verification email."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        # sent by the send_queued_emails worker, not inside the request
+        Util.queue_email(data)
         return Response(
             {"msg": "Verification email sent.", "token": token},
             status=status.HTTP_201_CREATED,
@@ -102,7 +106,7 @@ class UserEmailVerificationView(generics.GenericAPIView):
             )
 
 
-class UserLoginView(generics.GenericAPIView):
+class UserLoginView(HashingThrottleMixin, generics.GenericAPIView):
     serializer_class = UserLoginSerializer
     renderer_classes = [UserRenderer]
 
@@ -130,18 +134,18 @@ class UserProfileView(generics.GenericAPIView):
     renderer_classes = [UserRenderer]
 
     def get(self, request):
-        serializer = self.serializer_class(request.user)
+        serializer = self.serializer_class(get_request_user(request))
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class UserPasswordChangeView(generics.GenericAPIView):
+class UserPasswordChangeView(HashingThrottleMixin, generics.GenericAPIView):
     serializer_class = UserPasswordChangeSerializer
     permission_classes = [IsAuthenticated]
     renderer_classes = [UserRenderer]
 
     def post(self, request):
         serializer = self.serializer_class(
-            data=request.data, context={"user": request.user}
+            data=request.data, context={"user": get_request_user(request)}
         )
         serializer.is_valid(raise_exception=True)
         return Response(
@@ -178,20 +182,15 @@ class RequestPasswordResetEmailView(generics.GenericAPIView):
             "to_email": user.email,
         }
         print("Password reset link:", passwordResetLink)
-        try:
-            Util.send_email(data)
-        except:
-            return Response(
-                {"msg": "Error while sending password reset email."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        # sent by the send_queued_emails worker, not inside the request
+        Util.queue_email(data)
         return Response(
             {"msg": "Password reset email sent."},
             status=status.HTTP_200_OK,
         )
 
 
-class UserPasswordResetView(generics.GenericAPIView):
+class UserPasswordResetView(HashingThrottleMixin, generics.GenericAPIView):
     serializer_class = UserPasswordResetSerializer
     renderer_classes = [UserRenderer]
 
@@ -203,3 +202,20 @@ class UserPasswordResetView(generics.GenericAPIView):
         return Response(
             {"msg": "Password reset successfully."}, status=status.HTTP_200_OK
         )
+
+
+class TokenStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(
+            {
+                "outstanding": OutstandingToken.objects.count(),
+                "expired": OutstandingToken.objects.filter(
+                    expires_at__lte=timezone.now()
+                ).count(),
+                "blacklisted": BlacklistedToken.objects.count(),
+                "blacklist_cache": blacklist_cache_stats(),
+            },
+            status=status.HTTP_200_OK,
+        )